@@ -1,5 +1,6 @@
 from .game_item import (
     ITEMS,
+    OMEGA_ITEMS,
     ITEM_NAMES_NON_SELLABLE,
     ITEM_NAMES_RADIOACTIVE,
     ITEM_NAMES_LIQUID,
@@ -11,6 +12,7 @@ from .game_item import (
 from .game_resource_node import (
     PURITY_DURATION_FACTORS,
     RESOURCE_NODES,
+    OMEGA_RESOURCE_NODES,
     NODE_RECIPES_AVAILABLE,
     UNIQUE_NODES,
     get_resource_node_name,
@@ -21,6 +23,7 @@ from .game_resource_node import (
 
 from .game_building import (
     BUILDINGS,
+    OMEGA_BUILDINGS,
     BUILDING_NAMES_EXTRACTION,
     is_fracking,
     BuildingValues,
@@ -29,9 +32,12 @@ from .game_building import (
 
 from .game_recipe import (
     RECIPES,
+    OMEGA_RECIPES,
     RECIPE_NAMES_ALTERNATE,
     RECIPE_NAMES_HANDCRAFTED,
+    get_item_rate_matrix,
     RECIPE_NAMES_AUTOMATED,
+    OMEGA_RECIPES_AUTOMATED,
     get_extracted_resource_name,
     consumed_by,
     produced_by,
@@ -42,6 +48,7 @@ from .game_recipe import (
 
 from .game_schematic import (
     SCHEMATICS,
+    OMEGA_SCHEMATICS,
     unlock_recipe_by,
     unlock_building_by,
     SchematicFlags
@@ -9,15 +9,86 @@ Basic Data Types
 - Schematics                        x
 """
 
+from collections.abc import ItemsView, MutableMapping, ValuesView
 import copy
 import difflib
 import os
-from typing import Set, Dict, Iterable, Any, Optional
+from typing import Set, Dict, Iterable, Any, Optional, Tuple
+import weakref
 import yaml
 
 import numpy as np
 
 
+class Omega:
+    """
+    Ordered and immutable collection of valid names of Flags and Values. The
+    names are indexed by a dict for constant time lookup. Omegas are interned
+    by get_omega, so compatibility of two omegas with the same order is an
+    identity check.
+    """
+
+    def __init__(self, names: Tuple[str]):
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __getitem__(self, i: int) -> str:
+        return self.names[i]
+
+    def __contains__(self, name) -> bool:
+        return name in self.index
+
+    def __reduce__(self):
+        # intern again when unpickled, e.g. in another process
+        return get_omega, (self.names,)
+
+    def is_compatible(self, other: 'Omega') -> bool:
+        """
+        Return whether both omegas contain the same names. The order may differ.
+
+        Args:
+            other (Omega): Other omega
+
+        Returns:
+            bool: True if the names are identical
+        """
+        return self is other or self.index.keys() == other.index.keys()
+
+    def get_close_match_hint(self, name: str) -> str:
+        closest_matches = difflib.get_close_matches(name, self.names, n=1)
+        return f' Did you mean: "{closest_matches[0]}"?' if closest_matches else ''
+
+
+# omegas stay alive as long as a Flags or Values object references it
+_OMEGAS = weakref.WeakValueDictionary()
+
+
+def get_omega(names: Iterable[str]) -> Omega:
+    """
+    Get the shared omega of the names in the given order.
+
+    Args:
+        names (Iterable[str]): Valid names. The order is used for as_array.
+
+    Returns:
+        Omega: Interned omega
+    """
+    if isinstance(names, Omega):
+        return names
+    names = tuple(names)
+    omega = _OMEGAS.get(names)
+    if omega is None:
+        omega = Omega(names)
+        _OMEGAS[names] = omega
+    return omega
+
+
 class Flags(set):
     """
     Collection of flags that acts like a set with additional
@@ -39,16 +110,15 @@ class Flags(set):
             omega (Iterable[str]): Valid flags. The order is used for as_array.
         """
         data_ = set(data)
-        self._omega = tuple(omega)
+        self._omega = get_omega(omega)
         super().__init__()
         self.update(data_)
 
     def add(self, value: str):
         if not isinstance(value, str):
             raise ValueError('Accept only str')
-        if not value in self._omega:
-            closest_matches = difflib.get_close_matches(value, self._omega, n=1)
-            hint = f' Did you mean: "{closest_matches[0]}"?' if closest_matches else ''
+        if not value in self._omega.index:
+            hint = self._omega.get_close_match_hint(value)
             raise ValueError(f'Unknown flag: "{value}".{hint}')
         set.add(self, value)
 
@@ -64,20 +134,19 @@ class Flags(set):
     
     @classmethod
     def _from_array(cls, array: np.ndarray, omega: Iterable[str]) -> 'Flags':
-        omega_ = list(omega)
+        omega_ = get_omega(omega)
         if len(omega_) != len(array):
             raise ValueError('Array and omega must have equal length')
         data = {
-            flag_name
-            for i, flag_name in enumerate(omega_)
-            if bool(array[i])
+            omega_.names[i]
+            for i in np.flatnonzero(array).tolist()
         }
-        return cls(data, omega)
+        return cls(data, omega_)
 
     def __or__(self, other: 'Flags') -> 'Flags':
         if not isinstance(other, Flags):
             raise ValueError('Can only apply operation with other Flags objects')
-        if set(self._omega) != set(other._omega):
+        if not self._omega.is_compatible(other._omega):
             raise ValueError('Incompatible flags')
         return type(self)(set(self) | set(other), self._omega)
     
@@ -88,7 +157,7 @@ class Flags(set):
     def __and__(self, other: 'Flags') -> 'Flags':
         if not isinstance(other, Flags):
             raise ValueError('Can only apply operation with other Flags objects')
-        if set(self._omega) != set(other._omega):
+        if not self._omega.is_compatible(other._omega):
             raise ValueError('Incompatible flags')
         return type(self)(set(self) & set(other), self._omega)
 
@@ -104,7 +173,9 @@ class Flags(set):
         Returns:
             np.ndarray: Array with same order of values as omega
         """
-        return np.array([flag_name in self for flag_name in self._omega], dtype=bool)
+        array = np.zeros(len(self._omega), dtype=bool)
+        array[[self._omega.index[flag_name] for flag_name in self]] = True
+        return array
 
     def save(self, file_path: os.PathLike):
         """
@@ -133,15 +204,50 @@ class Flags(set):
         return cls(data, omega)
 
 
-class Values(dict):
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, np.integer, np.floating, np.bool_))
+
+
+def _full(size: int, value: Any) -> np.ndarray:
+    """
+    Create a vector with each entry set to value. Numbers are stored in a
+    float64 vector. Other values (e.g. solver variables) are copied for every
+    entry of an object vector.
+    """
+    if _is_number(value):
+        return np.full(size, value, dtype=np.float64)
+    array = np.empty(size, dtype=object)
+    for i in range(size):
+        array[i] = copy.deepcopy(value)
+    return array
+
+
+class _ValuesItemsView(ItemsView):
+    def __iter__(self):
+        return zip(self._mapping._omega.names, self._mapping._array.tolist())
+
+
+class _ValuesValuesView(ValuesView):
+    def __iter__(self):
+        return iter(self._mapping._array.tolist())
+
+
+class Values(MutableMapping):
     """
     Collection of named values that acts like a dict with additional
     functionality:
-     - basic math (+ and -)
+     - basic math (+, - and *) vectorized over all keys
      - check keys to be valid
      - IO methods
+
+    The values are stored in one vector in the order of omega. Numbers are
+    stored as float64. Any other value (e.g. solver variables) switches the
+    vector to dtype object.
     """
 
+    # let numpy defer to the reflected operators of Values
+    __array_ufunc__ = None
+
     def __init__(
             self,
             data: Dict[str, Any],
@@ -157,30 +263,84 @@ class Values(dict):
             default_value (Any, optional): Default value for undefined keys of
                 omega in data. Value is copied for every entry. Defaults to 0.
         """
-        self._omega = tuple(omega)
+        self._omega = get_omega(omega)
         self._default_value = default_value
-        super().__init__()
-        self.update(data)
         # Idea: data is completed on construction
-        # + easy handling in methods, reuse dict methods `__getitem__`, `__iter__`, ...
+        # + easy handling in methods, vectorized arithmetics
         # - larger in memory, need to overwrite method `clear`
-        self.update({
-            k: copy.deepcopy(default_value)
-            for k in set(self._omega) - set(data)
-        })
+        self._array = _full(len(self._omega), default_value)
+        self.update(data)
 
-    # Overwrite dict.__setitem__ to check key
+    def _new(self, array: np.ndarray) -> 'Values':
+        # create an object of the same type and omega without validation
+        out = object.__new__(type(self))
+        out._omega = self._omega
+        out._default_value = self._default_value
+        out._array = array
+        return out
+
+    def _aligned_array(self, other: 'Values') -> np.ndarray:
+        # array of other in the order of omega of self
+        if not isinstance(other, Values):
+            raise ValueError('Can only apply operation with other Amounts objects')
+        if other._omega is self._omega:
+            return other._array
+        if not self._omega.is_compatible(other._omega):
+            raise ValueError('Incompatible amounts')
+        return other._array[[other._omega.index[key] for key in self._omega]]
+
+    ############################ Mapping interface ############################
+
+    def __getitem__(self, key: str):
+        return self._array.item(self._omega.index[key])
+
+    # check key and keep the dtype of the vector valid for the value
     def __setitem__(self, key: str, value):
         if not isinstance(key, str):
             raise ValueError('Expect keys of data to be of type str')
-        if not key in self._omega:
-            closest_matches = difflib.get_close_matches(key, self._omega, n=1)
-            hint = f' Did you mean: "{closest_matches[0]}"?' if closest_matches else ''
+        if not key in self._omega.index:
+            hint = self._omega.get_close_match_hint(key)
             raise ValueError(f'Unknown key: {key}.{hint}')
-        dict.__setitem__(self, key, value)
+        if self._array.dtype != object:
+            if not _is_number(value):
+                self._array = self._array.astype(object)
+            elif (self._array.dtype.kind == 'i'
+                  and not isinstance(value, (int, np.integer, np.bool_))):
+                self._array = self._array.astype(np.float64)
+        self._array[self._omega.index[key]] = value
+
+    # self must always contain all keys
+    def __delitem__(self, key: str):
+        raise ValueError('Can not remove keys. Use clear or set_values instead')
+
+    def __iter__(self):
+        return iter(self._omega)
+
+    def __len__(self) -> int:
+        return len(self._omega)
+
+    def __contains__(self, key) -> bool:
+        return key in self._omega.index
+
+    def items(self) -> ItemsView:
+        return _ValuesItemsView(self)
+
+    def values(self) -> ValuesView:
+        return _ValuesValuesView(self)
+
+    def __eq__(self, other) -> bool:
+        if (isinstance(other, Values)
+                and self._array.dtype != object
+                and other._array.dtype != object
+                and self._omega.is_compatible(other._omega)):
+            return bool(np.array_equal(self._array, self._aligned_array(other)))
+        return super().__eq__(other)
 
-    # Overwrite dict.update as it doesn't call __setitem__
     def update(self, *args, **kwargs):
+        if (len(args) == 1 and not kwargs and isinstance(args[0], Values)
+                and args[0]._omega is self._omega):
+            self._array = args[0]._array.copy()
+            return
         for k, v in dict(*args, **kwargs).items():
             self[k] = v
 
@@ -191,17 +351,11 @@ class Values(dict):
         Args:
             val (Any): The new value
         """
-        self.update({k: copy.deepcopy(val) for k in self._omega})
+        self._array = _full(len(self._omega), val)
 
-    # Overwrite dict.copy as it outputs only a dict
     def copy(self) -> 'Values':
-        return type(self)(
-            data=self,
-            omega=self._omega,
-            default_value=self._default_value
-        )
+        return self._new(self._array.copy())
 
-    # Overwrites dict.clear as self must always contain all keys
     def clear(self):
         """
         Reset all values to the default value
@@ -212,67 +366,68 @@ class Values(dict):
     
     @classmethod
     def _from_array(cls, array: np.ndarray, omega: Iterable[str]) -> 'Values':
-        omega_ = list(omega)
-        if len(omega_) != len(array):
+        out = cls({}, omega)
+        array = np.asarray(array)
+        if len(out._omega) != len(array):
             raise ValueError('Array and omega must have equal length')
-        data = {
-            k: v
-            for k, v in zip(omega_, array)
-        }
-        return cls(data, omega)
+        if array.dtype.kind in 'biuf':
+            out._array = array.astype(np.float64)
+        else:
+            out._array = array.astype(object)
+        return out
 
     def as_array(self) -> np.ndarray:
         """
-        Return values as numpy array based omega
+        Return values as numpy array based omega. If the values are numbers,
+        the array is a view on the stored values and no copy is made.
 
         Returns:
             np.ndarray: Array with same order of values as omega
         """
-        return np.array([self[k] for k in self._omega], np.float64)
+        if self._array.dtype == np.float64:
+            return self._array
+        return self._array.astype(np.float64)
 
     ########################### Arithmetics ###################################
 
     def __add__(self, other: 'Values') -> 'Values':
-        if not isinstance(other, Values):
-            raise ValueError('Can only apply operation with other Amounts objects')
-        if set(self._omega) != set(other._omega):
-            raise ValueError('Incompatible amounts')
-        out = self.copy()
-        for key in self:
-            out[key] += other[key]
-        return out
+        return self._new(self._array + self._aligned_array(other))
     
     def __iadd__(self, other: 'Values') -> 'Values':
-        self.update(self + other)
+        other_array = self._aligned_array(other)
+        if np.result_type(self._array, other_array) == self._array.dtype:
+            self._array += other_array
+        else:
+            self._array = self._array + other_array
         return self
 
     def __sub__(self, other: 'Values') -> 'Values':
-        if not isinstance(other, Values):
-            raise ValueError('Can only apply operation with other Amounts objects')
-        if set(self._omega) != set(other._omega):
-            raise ValueError('Incompatible amounts')
-        out = self.copy()
-        for key in self:
-            out[key] -= other[key]
-        return out
+        return self._new(self._array - self._aligned_array(other))
 
     def __isub__(self, other: 'Values') -> 'Values':
-        self.update(self - other)
+        other_array = self._aligned_array(other)
+        if np.result_type(self._array, other_array) == self._array.dtype:
+            self._array -= other_array
+        else:
+            self._array = self._array - other_array
         return self
 
     def __mul__(self, factor):
         if isinstance(factor, Values):
             raise ValueError('Can not multiply Values with itself')
-        return type(self)(
-            {
-                name: val * factor
-                for name, val in self.items()
-            },
-            omega=self._omega
-        )
+        return self._new(self._array * factor)
 
     def __rmul__(self, factor):
         return self * factor
+
+    def __imul__(self, factor):
+        if isinstance(factor, Values):
+            raise ValueError('Can not multiply Values with itself')
+        if _is_number(factor) and np.result_type(self._array, factor) == self._array.dtype:
+            self._array *= factor
+        else:
+            self._array = self._array * factor
+        return self
     
     ################################ I/O ######################################
 
@@ -287,13 +442,15 @@ class Values(dict):
         Returns:
             Values: Rounded values
         """
-        return type(self)(
-            {
-                k: round(v, ndigits)
-                for k, v in self.items()
-            },
-            omega=self._omega
-        )
+        if self._array.dtype == object:
+            array = np.empty(len(self._array), dtype=object)
+            array[:] = [round(v, ndigits) for v in self._array]
+            return self._new(array)
+        if ndigits is not None:
+            return self._new(np.round(self._array, ndigits))
+        if not np.isfinite(self._array).all():
+            raise ValueError('Can not round non-finite values to integer')
+        return self._new(np.rint(self._array).astype(np.int64))
 
     # can not use default value because ortools variables have no comparison method
     def as_dict_ignoring(self, ignore_value: Any) -> Dict[str, Any]:
@@ -307,7 +464,13 @@ class Values(dict):
         Returns:
             Dict[str, Any]: result dict
         """
-        return {k:v for k,v in self.items() if v != ignore_value}
+        if self._array.dtype == object:
+            return {k:v for k,v in self.items() if v != ignore_value}
+        indices = np.flatnonzero(self._array != ignore_value)
+        return {
+            self._omega.names[i]: v
+            for i, v in zip(indices.tolist(), self._array[indices].tolist())
+        }
     
     def __str__(self) -> str:
         return str(self.as_dict_ignoring(0))
@@ -3,7 +3,25 @@ import sys, os
 
 print('Add', os.getcwd(), 'to path')
 sys.path.append(os.getcwd())
-from assistory.game.base_types import Flags, Values
+from assistory.game.base_types import Flags, Values, get_omega
+
+
+class OmegaTest(unittest.TestCase):
+
+    def test_interned(self):
+        omega = get_omega(['x', 'y'])
+        self.assertIs(omega, get_omega(('x', 'y')))
+        self.assertIs(omega, get_omega(omega))
+        self.assertIsNot(omega, get_omega(['y', 'x']))
+        self.assertTrue(omega.is_compatible(get_omega(['y', 'x'])))
+        self.assertFalse(omega.is_compatible(get_omega(['x', 'z'])))
+
+    def test_shared_by_flags_and_values(self):
+        flags = Flags({'x'}, ['x', 'y'])
+        values = Values({'x': 1}, ['x', 'y'])
+        self.assertIs(flags._omega, values._omega)
+        self.assertIs(flags._omega, (flags | flags.copy())._omega)
+        self.assertIs(values._omega, (values + values)._omega)
 
 
 class FlagsTest(unittest.TestCase):
@@ -118,6 +136,41 @@ class ValuesTest(unittest.TestCase):
         v_out = v.round(None)
         self.assertEqual(int, type(v_out['a']))
 
+    def test_add_sub(self):
+        C = self.A + self.B
+        self.assertEqual(C, Values({'a': 5}, omega=['a', 'b']))
+        self.assertEqual(C - self.B, self.A)
+        with self.assertRaises(ValueError):
+            self.A + Values({}, omega=['a', 'c'])
+
+    def test_add_different_omega_order(self):
+        B = Values({'a': 4, 'b': 1}, omega=['b', 'a'])
+        C = self.A + B
+        self.assertEqual(5, C['a'])
+        self.assertEqual(1, C['b'])
+
+    def test_inplace_operations(self):
+        A = self.A.copy()
+        A_id = id(A)
+        array = A.as_array()
+        A += self.B
+        A -= self.A
+        A *= 0.5
+        self.assertEqual(A_id, id(A))
+        self.assertEqual(A, Values({'a': 2}, omega=['a', 'b']))
+        # view on the values
+        self.assertIs(array, A.as_array())
+        self.assertEqual(2, array[0])
+
+    def test_non_number_values(self):
+        values = Values({'a': 'x'}, omega=['a', 'b'], default_value='y')
+        self.assertEqual('x', values['a'])
+        self.assertEqual('y', values['b'])
+        values = Values({'a': 1}, omega=['a', 'b'])
+        values['b'] = 'y'
+        self.assertEqual(1, values['a'])
+        self.assertEqual({'a': 1, 'b': 'y'}, values.as_dict_ignoring(0))
+
 # Run the tests
 if __name__ == '__main__':
     unittest.main()
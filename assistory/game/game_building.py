@@ -1,19 +1,16 @@
-import json
 import os
 from typing import Dict, Iterable, Any
 
 import numpy as np
 
-from .base_types import Flags, Values
+from .base_types import Flags, Values, get_omega
+from .game_database import DATABASE, LazyTable
 from .game_item import ItemValues
 from .utils import transform_to_dict
 
 
-with open('data/data.json', 'r') as fp:
-    data = json.load(fp)
-
-
 def define_buildings():
+    data = DATABASE.data
     facilities = {
         building_name: {
             'power_consumption': vals['metadata']['powerConsumption'],
@@ -30,7 +27,9 @@ def define_buildings():
     return facilities
 # Mapping of building name to power consumption and costs
 # Buildings consume and produce power and items
-BUILDINGS = define_buildings()
+BUILDINGS = LazyTable('BUILDINGS', define_buildings)
+# Shared omega of BuildingValues and BuildingFlags
+OMEGA_BUILDINGS = get_omega(DATABASE.data['buildings'])
 # Note: over/underclocking would make the problem non-linear
 
 
@@ -61,21 +60,21 @@ class BuildingValues(Values):
 
     def __init__(self,
                  data: Dict[str, Any]=dict(),
-                 omega: Iterable[str]=BUILDINGS,
+                 omega: Iterable[str]=OMEGA_BUILDINGS,
                  default_value: Any=0):
         super().__init__(data, omega, default_value)
 
     @classmethod
     def from_array(cls,
                    array: np.ndarray,
-                   omega: Iterable[str]=BUILDINGS
+                   omega: Iterable[str]=OMEGA_BUILDINGS
                    ) -> 'BuildingValues':
         return cls._from_array(array, omega)
     
     @classmethod
     def load(cls, 
              file_path: os.PathLike,
-             omega: Iterable[str]=BUILDINGS
+             omega: Iterable[str]=OMEGA_BUILDINGS
              ) -> 'BuildingValues':
         return super()._load(file_path, omega)
     
@@ -110,19 +109,19 @@ class BuildingValues(Values):
 class BuildingFlags(Flags):
     def __init__(self,
                  data: Iterable[str]=[],
-                 omega: Iterable[str]=BUILDINGS):
+                 omega: Iterable[str]=OMEGA_BUILDINGS):
         super().__init__(data, omega)
 
     @classmethod
     def from_array(cls,
                    array: np.ndarray,
-                   omega: Iterable[str]=BUILDINGS
+                   omega: Iterable[str]=OMEGA_BUILDINGS
                    ) -> 'BuildingFlags':
         return cls._from_array(array, omega)
 
     @classmethod
     def load(cls,
              file_path: os.PathLike,
-             omega: Iterable[str]=BUILDINGS
+             omega: Iterable[str]=OMEGA_BUILDINGS
              ) -> 'BuildingFlags':
         return super()._load(file_path, omega)
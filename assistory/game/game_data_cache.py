@@ -0,0 +1,284 @@
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+
+# Increase whenever the layout or the derivation of the compiled tables changes
+CACHE_VERSION = 1
+
+
+class CompiledGameData:
+    """
+    Tables derived from the game data in a compact array form. Sparse tables
+    are stored column-wise (one column per recipe or schematic) as the arrays
+    NAME_indptr, NAME_indices and optionally NAME_data.
+    """
+
+    def __init__(self, index: dict, arrays: Dict[str, np.ndarray]):
+        """
+        Create compiled game data
+
+        Args:
+            index (dict): Data hash, cache version and the names of the omegas
+            arrays (Dict[str, np.ndarray]): Compiled arrays by name
+        """
+        self.index = index
+        self.arrays = arrays
+
+    def get_dense(self, name: str, size: int) -> np.ndarray:
+        """
+        Return a sparse table as dense array with one row per column of the
+        table.
+
+        Args:
+            name (str): Name of the sparse table
+            size (int): Number of rows of the table
+
+        Returns:
+            np.ndarray: Array of shape (number of columns, size). Boolean
+                for tables without data.
+        """
+        indptr = np.asarray(self.arrays[f'{name}_indptr'])
+        indices = np.asarray(self.arrays[f'{name}_indices'])
+        columns = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        if f'{name}_data' in self.arrays:
+            dense = np.zeros((len(indptr) - 1, size), dtype=np.float64)
+            dense[columns, indices] = self.arrays[f'{name}_data']
+        else:
+            dense = np.zeros((len(indptr) - 1, size), dtype=bool)
+            dense[columns, indices] = True
+        return dense
+
+    def get_column_indices(self, name: str, j: int) -> np.ndarray:
+        """
+        Return the row indices of the non-zero entries in a column of a
+        sparse table.
+
+        Args:
+            name (str): Name of the sparse table
+            j (int): Index of the column
+
+        Returns:
+            np.ndarray: Row indices
+        """
+        indptr = self.arrays[f'{name}_indptr']
+        return np.asarray(self.arrays[f'{name}_indices'][int(indptr[j]):int(indptr[j + 1])])
+
+
+def _to_sparse_columns(name: str, columns: Iterable[np.ndarray], with_data: bool=True) -> Dict[str, np.ndarray]:
+    indptr = [0]
+    indices = []
+    data = []
+    for column in columns:
+        nonzero = np.flatnonzero(column)
+        indptr.append(indptr[-1] + len(nonzero))
+        indices.append(nonzero)
+        data.append(column[nonzero])
+    arrays = {
+        f'{name}_indptr': np.array(indptr, dtype=np.int64),
+        f'{name}_indices': np.concatenate(indices).astype(np.int32),
+    }
+    if with_data:
+        arrays[f'{name}_data'] = np.concatenate(data).astype(np.float64)
+    return arrays
+
+
+def get_compiled_index() -> dict:
+    """
+    Return the index the compiled game data must match: cache version and
+    the names of all omegas in order.
+
+    Returns:
+        dict: Index without the data hash
+    """
+    from .game_item import OMEGA_ITEMS
+    from .game_building import OMEGA_BUILDINGS
+    from .game_recipe import OMEGA_RECIPES
+    from .game_schematic import OMEGA_SCHEMATICS
+    from .game_resource_node import OMEGA_RESOURCE_NODES
+    return {
+        'version': CACHE_VERSION,
+        'items': list(OMEGA_ITEMS),
+        'buildings': list(OMEGA_BUILDINGS),
+        'recipes': list(OMEGA_RECIPES),
+        'schematics': list(OMEGA_SCHEMATICS),
+        'resource_nodes': list(OMEGA_RESOURCE_NODES),
+    }
+
+
+def compile_game_data(data_hash: str) -> CompiledGameData:
+    """
+    Build and validate all derived tables from the parsed game data and
+    compile them into arrays.
+
+    Args:
+        data_hash (str): Hash of the data files the tables are built from
+
+    Returns:
+        CompiledGameData: Compiled tables
+    """
+    from .game_recipe import (
+        RECIPE_NAMES_HANDCRAFTED,
+        define_recipes,
+        get_recipe_cycle_time
+    )
+    from .game_schematic import define_schematics
+    from .game_resource_node import UNIQUE_NODES, define_node_recipes_available
+
+    index = get_compiled_index()
+    index['hash'] = data_hash
+
+    recipes = define_recipes()
+    ingredients = [recipes[name]['ingredients'].as_array() for name in index['recipes']]
+    products = [recipes[name]['products'].as_array() for name in index['recipes']]
+    cycle_times = np.array([
+        get_recipe_cycle_time(recipes[name])
+        for name in index['recipes']
+    ])
+    handcraft_cycle_times = np.array([
+        get_recipe_cycle_time(recipes[name], handcraft=True)
+        if name in RECIPE_NAMES_HANDCRAFTED else np.inf
+        for name in index['recipes']
+    ])
+    schematics = define_schematics()
+    node_recipes_available = define_node_recipes_available(UNIQUE_NODES.keys())
+
+    arrays = dict()
+    arrays.update(_to_sparse_columns('recipe_ingredients', ingredients))
+    arrays.update(_to_sparse_columns('recipe_products', products))
+    arrays.update(_to_sparse_columns(
+        'item_rate_matrix',
+        ((p - i) / t for i, p, t in zip(ingredients, products, cycle_times))
+    ))
+    # handcraft matrix has empty columns for recipes that can not be handcrafted
+    arrays.update(_to_sparse_columns(
+        'item_rate_matrix_handcraft',
+        ((p - i) / t for i, p, t in zip(ingredients, products, handcraft_cycle_times))
+    ))
+    arrays.update(_to_sparse_columns(
+        'schematic_costs',
+        # unknown amounts (None) are stored as NaN
+        (schematics[name]['costs'].as_array().astype(np.float64) for name in index['schematics'])
+    ))
+    arrays.update(_to_sparse_columns(
+        'schematic_unlock_recipes',
+        (schematics[name]['unlock_recipes'].as_array() for name in index['schematics']),
+        with_data=False
+    ))
+    arrays.update(_to_sparse_columns(
+        'schematic_unlock_buildings',
+        (schematics[name]['unlock_buildings'].as_array() for name in index['schematics']),
+        with_data=False
+    ))
+    arrays['node_recipes_available'] = np.array(
+        [node_recipes_available[name] for name in index['resource_nodes']],
+        dtype=np.float64
+    )
+    return CompiledGameData(index, arrays)
+
+
+def _load_index(target_dir: Path) -> Optional[dict]:
+    try:
+        with open(target_dir / 'index.json', 'r') as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+
+def save_compiled_game_data(compiled: CompiledGameData, cache_dir: os.PathLike):
+    """
+    Save the compiled game data as one .npy file per array plus index.json
+    into a directory named by the data hash. Directories of other data
+    hashes are removed.
+
+    Args:
+        compiled (CompiledGameData): Compiled game data
+        cache_dir (os.PathLike): Directory containing the cached versions
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    target_dir = cache_dir / compiled.index['hash']
+    if target_dir.exists() and _load_index(target_dir) != compiled.index:
+        # outdated cache of the same data
+        shutil.rmtree(target_dir, ignore_errors=True)
+    # write to a temporary directory and rename it so that concurrent
+    # processes never see a partially written cache
+    tmp_dir = Path(tempfile.mkdtemp(dir=cache_dir, prefix='.tmp-'))
+    try:
+        for name, array in compiled.arrays.items():
+            np.save(tmp_dir / f'{name}.npy', array)
+        with open(tmp_dir / 'index.json', 'w') as fp:
+            json.dump(compiled.index, fp, separators=(',', ':'))
+        os.rename(tmp_dir, target_dir)
+    except OSError:
+        # another process has written the same cache
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if _load_index(target_dir) != compiled.index:
+            raise
+    for path in cache_dir.iterdir():
+        if path.is_dir() and path != target_dir and not path.name.startswith('.tmp-'):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def load_compiled_game_data(cache_dir: os.PathLike, index: dict) -> Optional[CompiledGameData]:
+    """
+    Memory-map the compiled game data if a cache matching the index exists.
+
+    Args:
+        cache_dir (os.PathLike): Directory containing the cached versions
+        index (dict): Expected index including the data hash
+
+    Returns:
+        Optional[CompiledGameData]: Compiled game data or None if there is no
+            matching cache
+    """
+    target_dir = Path(cache_dir) / index['hash']
+    if _load_index(target_dir) != index:
+        return None
+    try:
+        arrays = {
+            path.stem: np.load(path, mmap_mode='r')
+            for path in target_dir.glob('*.npy')
+        }
+    except (OSError, ValueError):
+        return None
+    return CompiledGameData(index, arrays)
+
+
+def get_compiled_game_data(data_hash: str, cache_dir: Optional[os.PathLike]) -> CompiledGameData:
+    """
+    Load the compiled game data from the cache or compile and cache it.
+
+    Args:
+        data_hash (str): Hash of the data files
+        cache_dir (Optional[os.PathLike]): Directory containing the cached
+            versions. No cache is used if None.
+
+    Returns:
+        CompiledGameData: Compiled game data
+    """
+    if cache_dir is not None:
+        index = get_compiled_index()
+        index['hash'] = data_hash
+        compiled = load_compiled_game_data(cache_dir, index)
+        if compiled is not None:
+            return compiled
+    compiled = compile_game_data(data_hash)
+    if cache_dir is not None:
+        try:
+            save_compiled_game_data(compiled, cache_dir)
+        except OSError:
+            # read-only data directory, work with the tables in memory
+            pass
+    return compiled
+
+
+if __name__ == '__main__':
+    from .game_database import DATABASE
+    DATABASE.compiled
+    print('Compiled game data:', DATABASE.cache_dir / DATABASE.data_hash)
@@ -0,0 +1,58 @@
+import unittest
+import sys, os
+import tempfile
+
+import numpy as np
+
+print('Add', os.getcwd(), 'to path')
+sys.path.append(os.getcwd())
+from assistory.game.game_database import DATABASE
+from assistory.game.game_data_cache import (
+    compile_game_data,
+    save_compiled_game_data,
+    load_compiled_game_data,
+    get_compiled_game_data,
+)
+from assistory.game.game_recipe import RECIPES, define_recipes
+from assistory.game.game_schematic import SCHEMATICS, define_schematics
+
+
+class TestGameDataCache(unittest.TestCase):
+
+    def test_tables_equal_to_data(self):
+        recipes = define_recipes()
+        for recipe_name, recipe in recipes.items():
+            self.assertEqual(recipe, RECIPES[recipe_name])
+        schematics = define_schematics()
+        for schematic_name, schematic in schematics.items():
+            self.assertEqual(schematic, SCHEMATICS[schematic_name])
+
+    def test_save_load(self):
+        compiled = compile_game_data(DATABASE.data_hash)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.assertIsNone(load_compiled_game_data(cache_dir, compiled.index))
+            save_compiled_game_data(compiled, cache_dir)
+            loaded = load_compiled_game_data(cache_dir, compiled.index)
+            self.assertEqual(set(compiled.arrays), set(loaded.arrays))
+            for name, array in compiled.arrays.items():
+                np.testing.assert_array_equal(array, loaded.arrays[name])
+            self.assertIsNone(load_compiled_game_data(
+                cache_dir,
+                dict(compiled.index, version=-1)
+            ))
+
+    def test_get_compiled_game_data(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            compiled = get_compiled_game_data('test', cache_dir)
+            self.assertEqual(['test'], os.listdir(cache_dir))
+            loaded = get_compiled_game_data('test', cache_dir)
+            self.assertIsInstance(loaded.arrays['node_recipes_available'], np.memmap)
+            np.testing.assert_array_equal(
+                compiled.arrays['recipe_products_data'],
+                loaded.arrays['recipe_products_data']
+            )
+
+
+# Run the tests
+if __name__ == '__main__':
+    unittest.main()
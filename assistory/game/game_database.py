@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .game_data_cache import CompiledGameData
+
+
+# Data directory of the repository independent of the working directory
+DATA_DIR = Path(__file__).resolve().parents[2] / 'data'
+# Files the game data is derived from
+DATA_FILE_NAMES = ('data.json', 'resource_nodes.json', 'extension_data.json')
+
+
+class GameDatabase:
+    """
+    Access to the game data. Each data file is parsed at most once and the
+    tables derived from it are built on first access. The derived tables are
+    compiled once per version of the data files into a binary cache that is
+    memory-mapped by later processes.
+    """
+
+    def __init__(self, data_dir: os.PathLike=DATA_DIR, use_cache: bool=True):
+        """
+        Create a game database
+
+        Args:
+            data_dir (os.PathLike, optional): Directory of the data files.
+                Defaults to DATA_DIR.
+            use_cache (bool, optional): Load and save the compiled tables in
+                the cache directory next to the data. Defaults to True.
+        """
+        self.data_dir = Path(data_dir)
+        self.cache_dir = self.data_dir / 'cache' if use_cache else None
+        self._files: Dict[str, Any] = dict()
+        self._tables: Dict[str, Any] = dict()
+        self._data_hash: Optional[str] = None
+        self._compiled: Optional['CompiledGameData'] = None
+
+    def load_file(self, file_name: str) -> Any:
+        """
+        Return the content of a JSON file in the data directory. The file is
+        parsed on first access only.
+
+        Args:
+            file_name (str): Name of the file in the data directory
+
+        Returns:
+            Any: Parsed content
+        """
+        if not file_name in self._files:
+            with open(self.data_dir / file_name, 'r') as fp:
+                self._files[file_name] = json.load(fp)
+        return self._files[file_name]
+
+    @property
+    def data(self) -> dict:
+        return self.load_file('data.json')
+
+    @property
+    def resource_node_data(self) -> dict:
+        return self.load_file('resource_nodes.json')
+
+    @property
+    def data_hash(self) -> str:
+        """
+        SHA-256 hash of the data files identifying the version of the data
+        """
+        if self._data_hash is None:
+            sha = hashlib.sha256()
+            for file_name in DATA_FILE_NAMES:
+                sha.update(file_name.encode())
+                sha.update((self.data_dir / file_name).read_bytes())
+            self._data_hash = sha.hexdigest()
+        return self._data_hash
+
+    @property
+    def compiled(self) -> 'CompiledGameData':
+        """
+        Derived tables compiled into arrays. They are loaded from the cache
+        or compiled and cached on first access.
+        """
+        if self._compiled is None:
+            from .game_data_cache import get_compiled_game_data
+            self._compiled = get_compiled_game_data(self.data_hash, self.cache_dir)
+        return self._compiled
+
+    def get_table(self, name: str, define: Callable[[], Any]) -> Any:
+        """
+        Return a table derived from the game data. The table is built by
+        define on first access.
+
+        Args:
+            name (str): Unique name of the table
+            define (Callable[[], Any]): Function to build the table
+
+        Returns:
+            Any: The table
+        """
+        if not name in self._tables:
+            self._tables[name] = define()
+        return self._tables[name]
+
+
+DATABASE = GameDatabase()
+
+
+class LazyTable(Mapping):
+    """
+    Read-only mapping of a table of the game database that is built on first
+    access.
+    """
+
+    def __init__(self, name: str, define: Callable[[], Mapping]):
+        """
+        Create a lazy table
+
+        Args:
+            name (str): Unique name of the table in the game database
+            define (Callable[[], Mapping]): Function to build the table
+        """
+        self._name = name
+        self._define = define
+
+    def _get_table(self) -> Mapping:
+        return DATABASE.get_table(self._name, self._define)
+
+    def __getitem__(self, key):
+        return self._get_table()[key]
+
+    def __iter__(self):
+        return iter(self._get_table())
+
+    def __len__(self) -> int:
+        return len(self._get_table())
+
+    def __contains__(self, key) -> bool:
+        return key in self._get_table()
+
+    def __repr__(self) -> str:
+        return repr(self._get_table())
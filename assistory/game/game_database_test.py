@@ -0,0 +1,45 @@
+import unittest
+import sys, os
+
+print('Add', os.getcwd(), 'to path')
+sys.path.append(os.getcwd())
+from assistory.game.game_database import DATABASE, GameDatabase, LazyTable
+
+
+class TestGameDatabase(unittest.TestCase):
+
+    def test_parse_once(self):
+        database = GameDatabase()
+        self.assertIs(database.data, database.data)
+        self.assertIn('recipes', database.data)
+
+    def test_build_table_once(self):
+        database = GameDatabase()
+        calls = []
+        def define():
+            calls.append(1)
+            return {'x': 1}
+        self.assertEqual({'x': 1}, database.get_table('test', define))
+        self.assertIs(database.get_table('test', define), database.get_table('test', define))
+        self.assertEqual(1, len(calls))
+
+
+class TestLazyTable(unittest.TestCase):
+
+    def test_lazy(self):
+        calls = []
+        def define():
+            calls.append(1)
+            return {'x': 1}
+        table = LazyTable('test_lazy_table', define)
+        self.assertEqual(0, len(calls))
+        self.assertEqual(1, table['x'])
+        self.assertIn('x', table)
+        self.assertEqual({'x': 1}, dict(table))
+        self.assertEqual(1, len(calls))
+        self.assertIs(DATABASE.get_table('test_lazy_table', define), table._get_table())
+
+
+# Run the tests
+if __name__ == '__main__':
+    unittest.main()
@@ -1,21 +1,19 @@
-import json
 import os
 from typing import Dict, Iterable, Any
 
 import numpy as np
 
-from .base_types import Flags, Values
-
-
-with open('data/data.json', 'r') as fp:
-    data = json.load(fp)
+from .base_types import Flags, Values, get_omega
+from .game_database import DATABASE, LazyTable
 
 
 def define_items() -> dict:
     return {
-        item_name:v for item_name,v in data['items'].items()
+        item_name:v for item_name,v in DATABASE.data['items'].items()
     }
-ITEMS = define_items()
+ITEMS = LazyTable('ITEMS', define_items)
+# Shared omega of ItemValues and ItemFlags
+OMEGA_ITEMS = get_omega(DATABASE.data['items'])
 
 def define_non_sellable_items() -> list:
     return [
@@ -43,28 +41,28 @@ def define_liquid_items() -> list:
 ITEM_NAMES_LIQUID = define_liquid_items()
 
 def define_items_extraction():
-    return list(data['resources'].keys())
+    return list(DATABASE.data['resources'].keys())
 ITEM_NAMES_EXTRACTION = define_items_extraction()
 
 
 class ItemValues(Values):
     def __init__(self,
                  data: Dict[str, Any]=dict(),
-                 omega: Iterable[str]=ITEMS,
+                 omega: Iterable[str]=OMEGA_ITEMS,
                  default_value: Any=0):
         super().__init__(data, omega, default_value)
 
     @classmethod
     def from_array(cls,
                    array: np.ndarray,
-                   omega: Iterable[str]=ITEMS
+                   omega: Iterable[str]=OMEGA_ITEMS
                    ) -> 'ItemValues':
         return cls._from_array(array, omega)
 
     @classmethod
     def load(cls,
              file_path: os.PathLike,
-             omega: Iterable[str]=ITEMS
+             omega: Iterable[str]=OMEGA_ITEMS
              ) -> 'ItemValues':
         return super()._load(file_path, omega)
 
@@ -72,19 +70,19 @@ class ItemValues(Values):
 class ItemFlags(Flags):
     def __init__(self,
                  data: Iterable[str]=[],
-                 omega: Iterable[str]=ITEMS):
+                 omega: Iterable[str]=OMEGA_ITEMS):
         super().__init__(data, omega)
 
     @classmethod
     def from_array(cls,
                    array: np.ndarray,
-                   omega: Iterable[str]=ITEMS
+                   omega: Iterable[str]=OMEGA_ITEMS
                    ) -> 'ItemFlags':
         return cls._from_array(array, omega)
 
     @classmethod
     def load(cls,
              file_path: os.PathLike,
-             omega: Iterable[str]=ITEMS
+             omega: Iterable[str]=OMEGA_ITEMS
              ) -> 'ItemFlags':
         return super()._load(file_path, omega)
@@ -1,30 +1,31 @@
-import json
+import functools
 import os
-from typing import Dict, Iterable, Any, Optional
+from typing import Dict, Iterable, Any, Optional, Tuple, TYPE_CHECKING
 
 import numpy as np
 
-from .base_types import Flags, Values
-from .game_item import ITEMS, ITEM_NAMES_EXTRACTION, ItemValues, ItemFlags
+from .base_types import Flags, Values, Omega, get_omega
+from .game_database import DATABASE, LazyTable
+from .game_item import ITEMS, OMEGA_ITEMS, ITEM_NAMES_EXTRACTION, ItemValues, ItemFlags
 from .game_building import BUILDINGS, is_fracking, BuildingValues, BuildingFlags
 from .game_resource_node import get_resource_node_name, ResourceNodeValues
 from .utils import transform_to_dict
 
+if TYPE_CHECKING:
+    # scipy is imported when the item rate matrices are built
+    from scipy import sparse
+
 
 # Handcrafted cycle is faster than building recipe by this factor
 # Note: Additionally, cycle is affected by recipe['manualTimeMultiplier']
 HANDCRAFT_CYCLE_MULTIPLIER = 0.125
 
 
-with open('data/data.json', 'r') as fp:
-    data = json.load(fp)
-
-
 # recipes in buildings
 def define_recipes():
     recipes = dict()
 
-    for recipe_name, v in data['recipes'].items():
+    for recipe_name, v in DATABASE.data['recipes'].items():
         if len(v['producedIn']) > 1:
             raise ValueError(f'Expect at most one production facility for {recipe_name}. '
                              f'Got: {v["producedIn"]}.')
@@ -48,8 +49,29 @@ def define_recipes():
         }
 
     return recipes
+
+
+def load_recipes():
+    # ingredients and products from the compiled game data, which has been
+    # validated by define_recipes when it was compiled
+    compiled = DATABASE.compiled
+    ingredients = compiled.get_dense('recipe_ingredients', len(OMEGA_ITEMS))
+    products = compiled.get_dense('recipe_products', len(OMEGA_ITEMS))
+    recipes = dict()
+    for r, (recipe_name, v) in enumerate(DATABASE.data['recipes'].items()):
+        recipes[recipe_name] = {
+            'name': v['name'],
+            'ingredients': ItemValues.from_array(ingredients[r]),
+            'products': ItemValues.from_array(products[r]),
+            'producedIn': set(v['producedIn']),
+            'time': float(v['time']),
+            'manualTimeMultiplier': float(v['manualTimeMultiplier'])
+        }
+    return recipes
 # recipies define ingredients, products, production facility and production time
-RECIPES = define_recipes()
+RECIPES = LazyTable('RECIPES', load_recipes)
+# Shared omega of RecipeValues and RecipeFlags
+OMEGA_RECIPES = get_omega(DATABASE.data['recipes'])
 
 
 def get_extracted_resource_name(recipe_name: str) -> Optional[str]:
@@ -76,39 +98,54 @@ def get_extracted_resource_name(recipe_name: str) -> Optional[str]:
 # Alternate recipes are unlocked by research
 RECIPE_NAMES_ALTERNATE = {
     recipe_name
-    for recipe_name in RECIPES
-    if data['recipes'][recipe_name]['alternate']
+    for recipe_name, v in DATABASE.data['recipes'].items()
+    if v['alternate']
 }
 
 
 # Automated recipes have a producedIn building
 RECIPE_NAMES_AUTOMATED = {
     recipe_name
-    for recipe_name in RECIPES
-    if data['recipes'][recipe_name]['inMachine']
+    for recipe_name, v in DATABASE.data['recipes'].items()
+    if v['inMachine']
 }
+# Shared omega of values and flags of automated recipes
+OMEGA_RECIPES_AUTOMATED = get_omega(RECIPE_NAMES_AUTOMATED)
 
 
 # Handcraft recipes can be executed by hand (and often by a machine)
 RECIPE_NAMES_HANDCRAFTED = {
     recipe_name
-    for recipe_name in RECIPES
-    if (data['recipes'][recipe_name]['inWorkshop'] or
-        data['recipes'][recipe_name]['inHand'])
+    for recipe_name, v in DATABASE.data['recipes'].items()
+    if v['inWorkshop'] or v['inHand']
 }
 
 
 # helper structure to find recipes
 def define_item_to_recipe_mappings():
-    consumed_by = { item_name: set() for item_name in ITEMS}
-    produced_by = { item_name: set() for item_name in ITEMS}
-    for recipe_name in RECIPES:
-        for item_name in RECIPES[recipe_name]['ingredients'].as_dict_ignoring(0):
-            consumed_by[item_name].add(recipe_name)
-        for item_name in RECIPES[recipe_name]['products'].as_dict_ignoring(0):
-            produced_by[item_name].add(recipe_name)
+    compiled = DATABASE.compiled
+    consumed_by = { item_name: set() for item_name in OMEGA_ITEMS}
+    produced_by = { item_name: set() for item_name in OMEGA_ITEMS}
+    for r, recipe_name in enumerate(OMEGA_RECIPES):
+        for i in compiled.get_column_indices('recipe_ingredients', r).tolist():
+            consumed_by[OMEGA_ITEMS.names[i]].add(recipe_name)
+        for i in compiled.get_column_indices('recipe_products', r).tolist():
+            produced_by[OMEGA_ITEMS.names[i]].add(recipe_name)
     return consumed_by, produced_by
-consumed_by, produced_by = define_item_to_recipe_mappings()
+consumed_by = LazyTable(
+    'consumed_by',
+    lambda: DATABASE.get_table(
+        'item_to_recipe_mappings',
+        define_item_to_recipe_mappings
+    )[0]
+)
+produced_by = LazyTable(
+    'produced_by',
+    lambda: DATABASE.get_table(
+        'item_to_recipe_mappings',
+        define_item_to_recipe_mappings
+    )[1]
+)
 
 def define_building_to_recipe_mapping():
     building_name2recipe_name = {building_name: [] for building_name in BUILDINGS}
@@ -116,31 +153,158 @@ def define_building_to_recipe_mapping():
         for building_name in RECIPES[recipe_name]['producedIn']:
             building_name2recipe_name[building_name].append(recipe_name)
     return building_name2recipe_name
-produced_in = define_building_to_recipe_mapping()
+produced_in = LazyTable('produced_in', define_building_to_recipe_mapping)
+
+
+def get_cycle_time(recipe_name: str, handcraft: bool=False) -> float:
+    """
+    Return the duration of a single cycle of the recipe.
+
+    Args:
+        recipe_name (str): Name of the recipe
+        handcraft (bool, optional): Return the cycle time of handcrafting.
+            Defaults to False.
+
+    Returns:
+        float: Cycle time in minutes
+    """
+    return get_recipe_cycle_time(RECIPES[recipe_name], handcraft)
+
+
+def get_recipe_cycle_time(recipe: Dict[str, Any], handcraft: bool=False) -> float:
+    """
+    Return the duration of a single cycle of a recipe entry.
+
+    Args:
+        recipe (Dict[str, Any]): Entry of RECIPES
+        handcraft (bool, optional): Return the cycle time of handcrafting.
+            Defaults to False.
+
+    Returns:
+        float: Cycle time in minutes
+    """
+    cylce_time = recipe['time'] / 60 # in min
+    if handcraft:
+        cylce_time *= HANDCRAFT_CYCLE_MULTIPLIER * recipe['manualTimeMultiplier']
+    return cylce_time
+
+
+_RECIPES_HANDCRAFTED_MASK = np.array([
+    recipe_name in RECIPE_NAMES_HANDCRAFTED
+    for recipe_name in OMEGA_RECIPES
+])
+
+
+def define_item_rate_matrices() -> Tuple['sparse.csr_matrix', 'sparse.csr_matrix']:
+    from scipy import sparse
+
+    compiled = DATABASE.compiled
+    shape = (len(OMEGA_ITEMS), len(OMEGA_RECIPES))
+    item_rate_matrices = []
+    for name in ('item_rate_matrix', 'item_rate_matrix_handcraft'):
+        item_rate_matrix_csc = sparse.csc_matrix(
+            (
+                np.asarray(compiled.arrays[f'{name}_data']),
+                np.asarray(compiled.arrays[f'{name}_indices']),
+                np.asarray(compiled.arrays[f'{name}_indptr'])
+            ),
+            shape=shape
+        )
+        item_rate_matrices.append(item_rate_matrix_csc.tocsr())
+    return tuple(item_rate_matrices)
+
+
+def _get_item_rate_matrices(handcraft: bool) -> Tuple['sparse.csr_matrix', 'sparse.csc_matrix']:
+    item_rate_matrices = DATABASE.get_table(
+        'item_rate_matrices',
+        define_item_rate_matrices
+    )
+    item_rate_matrix = item_rate_matrices[1] if handcraft else item_rate_matrices[0]
+    item_rate_matrix_csc = DATABASE.get_table(
+        'item_rate_matrix_handcraft_csc' if handcraft else 'item_rate_matrix_csc',
+        item_rate_matrix.tocsc
+    )
+    return item_rate_matrix, item_rate_matrix_csc
+
+
+@functools.lru_cache(maxsize=128)
+def _get_recipe_columns(omega: Omega) -> np.ndarray:
+    return np.array(
+        [OMEGA_RECIPES.index[recipe_name] for recipe_name in omega],
+        dtype=np.int64
+    )
+
+
+def get_item_rate_matrix(
+        item_names: Iterable[str]=OMEGA_ITEMS,
+        recipe_names: Iterable[str]=OMEGA_RECIPES,
+        handcraft: bool=False,
+    ) -> 'sparse.csr_matrix':
+    """
+    Get the sparse item rate matrix of the recipes automated or handcrafted.
+    Recipes that can not be handcrafted have empty columns in the handcraft
+    matrix. The matrix is built once on first access.
+
+    Args:
+        item_names (Iterable[str], optional): Names of the items (rows) in
+            this order. Defaults to OMEGA_ITEMS.
+        recipe_names (Iterable[str], optional): Names of the recipes (columns)
+            in this order. Defaults to OMEGA_RECIPES.
+        handcraft (bool, optional): Use the rates of handcrafting. Defaults
+            to False.
+
+    Returns:
+        sparse.csr_matrix: matrix A[i,r]: rate of item i by one recipe r
+    """
+    item_rate_matrix, _ = _get_item_rate_matrices(handcraft)
+    if item_names is OMEGA_ITEMS and recipe_names is OMEGA_RECIPES:
+        return item_rate_matrix
+    rows = [OMEGA_ITEMS.index[item_name] for item_name in item_names]
+    cols = [OMEGA_RECIPES.index[recipe_name] for recipe_name in recipe_names]
+    return item_rate_matrix[rows][:, cols]
 
 
 class RecipeValues(Values):
 
     def __init__(self,
                  data: Dict[str, Any]=dict(),
-                 omega: Iterable[str]=RECIPES,
+                 omega: Iterable[str]=OMEGA_RECIPES,
                  default_value: Any=0):
         super().__init__(data, omega, default_value)
 
     @classmethod
     def from_array(cls,
                    array: np.ndarray,
-                   omega: Iterable[str]=RECIPES
+                   omega: Iterable[str]=OMEGA_RECIPES
                    ) -> 'RecipeValues':
         return cls._from_array(array, omega)
     
     @classmethod
     def load(cls,
              file_path: os.PathLike,
-             omega: Iterable[str]=RECIPES
+             omega: Iterable[str]=OMEGA_RECIPES
              ) -> 'RecipeValues':
         return super()._load(file_path, omega)
     
+    def _get_item_rates(self, handcraft: bool) -> ItemValues:
+        item_rate_matrix, item_rate_matrix_csc = _get_item_rate_matrices(handcraft)
+        cols = _get_recipe_columns(self._omega)
+        if self._array.dtype != object:
+            recipe_amounts = np.zeros(len(OMEGA_RECIPES))
+            recipe_amounts[cols] = self._array
+            return ItemValues.from_array(item_rate_matrix @ recipe_amounts)
+
+        # solver variables: sum up the nonzero entries of each column
+        item_rates = ItemValues()
+        indptr = item_rate_matrix_csc.indptr
+        for recipe_amount, col in zip(self._array, cols.tolist()):
+            start, end = indptr[col], indptr[col + 1]
+            for i, rate in zip(item_rate_matrix_csc.indices[start:end].tolist(),
+                               item_rate_matrix_csc.data[start:end].tolist()):
+                item_name = OMEGA_ITEMS.names[i]
+                item_rates[item_name] += rate * recipe_amount
+        return item_rates
+
     def get_item_rate_balance(self) -> ItemValues:
         """
         Return the overall balance of the item rate by summing up ingredients
@@ -149,19 +313,7 @@ class RecipeValues(Values):
         Returns:
             ItemAmounts: Item rate balance. Elements can be negative.
         """
-        item_rates = ItemValues()
-        for recipe_name, recipe_amount in self.items():
-            recipe = RECIPES[recipe_name]
-            cylce_time = recipe['time'] / 60 # in min
-            factor = recipe_amount / cylce_time
-            # TODO: removing zero filtering is too slow because of large sum result
-            ingredients = recipe['ingredients'].as_dict_ignoring(0)
-            for item_name, item_amount in ingredients.items():
-                item_rates[item_name] -= item_amount * factor
-            products = recipe['products'].as_dict_ignoring(0)
-            for item_name, item_amount in products.items():
-                item_rates[item_name] += item_amount * factor
-        return item_rates
+        return self._get_item_rates(handcraft=False)
     
     def get_item_rate_balance_handcraft(self) -> ItemValues:
         """
@@ -171,25 +323,17 @@ class RecipeValues(Values):
         Returns:
             ItemAmounts: Item rate balance. Elements can be negative.
         """
-        item_rates = ItemValues()
-        for recipe_name, recipe_amount in self.items():
-            if not recipe_name in RECIPE_NAMES_HANDCRAFTED:
-                if recipe_amount > 0:
+        if self._array.dtype != object:
+            handcrafted = _RECIPES_HANDCRAFTED_MASK[_get_recipe_columns(self._omega)]
+            invalid_recipes = np.flatnonzero(~handcrafted & (self._array > 0))
+            if len(invalid_recipes) > 0:
+                recipe_name = self._omega.names[invalid_recipes[0]]
+                raise ValueError(f'Recipe {recipe_name} is not allowed for handcrafting')
+        else:
+            for recipe_name, recipe_amount in self.items():
+                if not recipe_name in RECIPE_NAMES_HANDCRAFTED and recipe_amount > 0:
                     raise ValueError(f'Recipe {recipe_name} is not allowed for handcrafting')
-                else:
-                    continue
-            recipe = RECIPES[recipe_name]
-            cylce_time_automated = recipe['time'] / 60 # in min
-            cycle_time_multiplier = HANDCRAFT_CYCLE_MULTIPLIER * recipe['manualTimeMultiplier']
-            cylce_time = cylce_time_automated * cycle_time_multiplier
-            factor = recipe_amount / cylce_time
-            ingredients = recipe['ingredients'].as_dict_ignoring(0)
-            for item_name, item_amount in ingredients.items():
-                item_rates[item_name] -= item_amount * factor
-            products = recipe['products'].as_dict_ignoring(0)
-            for item_name, item_amount in products.items():
-                item_rates[item_name] += item_amount * factor
-        return item_rates
+        return self._get_item_rates(handcraft=True)
 
     def get_buildings(self) -> BuildingValues:
         """
@@ -233,20 +377,20 @@ class RecipeValues(Values):
 class RecipeFlags(Flags):
     def __init__(self,
                  data: Iterable[str]=[],
-                 omega: Iterable[str]=RECIPES):
+                 omega: Iterable[str]=OMEGA_RECIPES):
         super().__init__(data, omega)
 
     @classmethod
     def from_array(cls,
                    array: np.ndarray,
-                   omega: Iterable[str]=RECIPES
+                   omega: Iterable[str]=OMEGA_RECIPES
                    ) -> 'RecipeFlags':
         return cls._from_array(array, omega)
 
     @classmethod
     def load(cls,
              file_path: os.PathLike,
-             omega: Iterable[str]=RECIPES
+             omega: Iterable[str]=OMEGA_RECIPES
              ) -> 'RecipeFlags':
         return super()._load(file_path, omega)
 
@@ -5,7 +5,8 @@ print('Add', os.getcwd(), 'to path')
 sys.path.append(os.getcwd())
 from assistory.game.game_recipe import (
     RecipeValues, RecipeFlags, RECIPES, RECIPE_NAMES_HANDCRAFTED,
-    consumed_by, produced_by, produced_in, get_extracted_resource_name
+    consumed_by, produced_by, produced_in, get_extracted_resource_name,
+    get_item_rate_matrix
 )
 from assistory.game.game_item import ItemFlags, ITEMS
 from assistory.game.game_building import BuildingFlags, BUILDINGS
@@ -36,6 +37,25 @@ class TestRecipeModule(unittest.TestCase):
             'Desc_Water_C'
         )
 
+    def test_get_item_rate_matrix(self):
+        A = get_item_rate_matrix(
+            ['Desc_PackagedAlumina_C', 'Desc_AluminaSolution_C'],
+            ['Recipe_UnpackageAlumina_C', 'Recipe_PackagedAlumina_C']
+        ).toarray()
+        self.assertEqual((2, 2), A.shape)
+        self.assertAlmostEqual(-120, A[0, 0])
+        self.assertAlmostEqual(120, A[1, 0])
+        self.assertAlmostEqual(120, A[0, 1])
+        self.assertAlmostEqual(-120, A[1, 1])
+
+        A_handcraft = get_item_rate_matrix(
+            ['Desc_PackagedAlumina_C', 'Desc_OreIron_C'],
+            ['Recipe_PackagedAlumina_C', 'Recipe_HandcraftOreIron_C'],
+            handcraft=True
+        ).toarray()
+        self.assertEqual(0, A_handcraft[0, 0])
+        self.assertGreater(A_handcraft[1, 1], 0)
+
 
 class TestRecipeValues(unittest.TestCase):
 
@@ -1,17 +1,11 @@
-import json
 import os
 from typing import Dict, Iterable, Any
 
 import numpy as np
 
 from .utils import get_bare_name
-from .base_types import Values
-
-
-with open('data/data.json', 'r') as fp:
-    data = json.load(fp)
-with open('data/resource_nodes.json', 'r') as fp:
-    resource_node_data = json.load(fp)
+from .base_types import Values, get_omega
+from .game_database import DATABASE, LazyTable
 
 
 # effect of purity on production rate
@@ -127,11 +121,13 @@ def define_resource_nodes() -> Dict[str, str]:
 # Mapping from resource node name to its description as a
 # mapping {'resource_name':, 'extraction_method':, 'extraction_recipes':}
 RESOURCE_NODES = define_resource_nodes()
+# Shared omega of ResourceNodeValues
+OMEGA_RESOURCE_NODES = get_omega(RESOURCE_NODES)
 
 
 def define_unique_node_name_to_node_mapping():
-    return resource_node_data.copy()
-UNIQUE_NODES = define_unique_node_name_to_node_mapping()
+    return DATABASE.resource_node_data.copy()
+UNIQUE_NODES = LazyTable('UNIQUE_NODES', define_unique_node_name_to_node_mapping)
 
 
 def define_node_recipes_available(
@@ -153,7 +149,7 @@ def define_node_recipes_available(
     }
     # Fill with data
     for node_name in node_names:
-        values = resource_node_data[node_name]
+        values = DATABASE.resource_node_data[node_name]
         amount = PURITY_DURATION_FACTORS[values['purity']]
         resource_node_name = get_resource_node_name(
             values['resource'],
@@ -162,7 +158,13 @@ def define_node_recipes_available(
         node_recipes_available[resource_node_name] += amount
     return node_recipes_available
 # Mapping from resource node name to amount available
-NODE_RECIPES_AVAILABLE = define_node_recipes_available(UNIQUE_NODES.keys())
+NODE_RECIPES_AVAILABLE = LazyTable(
+    'NODE_RECIPES_AVAILABLE',
+    lambda: dict(zip(
+        OMEGA_RESOURCE_NODES,
+        DATABASE.compiled.arrays['node_recipes_available'].tolist()
+    ))
+)
 
 
 class ResourceNodeValues(Values):
@@ -172,20 +174,20 @@ class ResourceNodeValues(Values):
 
     def __init__(self,
                  data: Dict[str, Any]=dict(),
-                 omega: Iterable[str]=RESOURCE_NODES,
+                 omega: Iterable[str]=OMEGA_RESOURCE_NODES,
                  default_value: Any=0):
         super().__init__(data, omega, default_value)
 
     @classmethod
     def from_array(cls,
                    array: np.ndarray,
-                   omega: Iterable[str]=RESOURCE_NODES
+                   omega: Iterable[str]=OMEGA_RESOURCE_NODES
                    ) -> 'ResourceNodeValues':
         return cls._from_array(array, omega)
 
     @classmethod
     def load(cls,
              file_path: os.PathLike,
-             omega: Iterable[str]=RESOURCE_NODES
+             omega: Iterable[str]=OMEGA_RESOURCE_NODES
              ) -> 'ResourceNodeValues':
         return super()._load(file_path, omega)
@@ -1,23 +1,19 @@
-import json
 import os
 from typing import Iterable
 
 import numpy as np
 
-from .base_types import Flags
-from .game_item import ItemValues
-from .game_recipe import RECIPES, RecipeFlags
-from .game_building import BUILDINGS, BuildingFlags
+from .base_types import Flags, get_omega
+from .game_database import DATABASE, LazyTable
+from .game_item import OMEGA_ITEMS, ItemValues
+from .game_recipe import RECIPES, OMEGA_RECIPES, RecipeFlags
+from .game_building import BUILDINGS, OMEGA_BUILDINGS, BuildingFlags
 from .utils import transform_to_dict
 
 
-with open('data/data.json', 'r') as fp:
-    data = json.load(fp)
-
-
 def define_schematics():
     schematics = dict()
-    for schematic_name, v in data['schematics'].items():
+    for schematic_name, v in DATABASE.data['schematics'].items():
         cost = transform_to_dict(v['cost'])
         unlocked_recipes = set(v['unlock']['recipes'])
         unlocked_buildings = set(v['unlock']['buildings'])
@@ -28,7 +24,30 @@ def define_schematics():
             'unlock_buildings': BuildingFlags(unlocked_buildings)
         }
     return schematics
-SCHEMATICS = define_schematics()
+
+
+def load_schematics():
+    # costs and unlocks from the compiled game data
+    compiled = DATABASE.compiled
+    costs = compiled.get_dense('schematic_costs', len(OMEGA_ITEMS))
+    unlock_recipes = compiled.get_dense('schematic_unlock_recipes', len(OMEGA_RECIPES))
+    unlock_buildings = compiled.get_dense('schematic_unlock_buildings', len(OMEGA_BUILDINGS))
+    schematics = dict()
+    for s, (schematic_name, v) in enumerate(DATABASE.data['schematics'].items()):
+        cost = costs[s]
+        if np.isnan(cost).any():
+            # unknown amounts are None in the data
+            cost = np.where(np.isnan(cost), None, cost)
+        schematics[schematic_name] = {
+            'name': v['name'],
+            'costs': ItemValues.from_array(cost),
+            'unlock_recipes': RecipeFlags.from_array(unlock_recipes[s]),
+            'unlock_buildings': BuildingFlags.from_array(unlock_buildings[s])
+        }
+    return schematics
+SCHEMATICS = LazyTable('SCHEMATICS', load_schematics)
+# Shared omega of SchematicFlags
+OMEGA_SCHEMATICS = get_omega(DATABASE.data['schematics'])
 
 
 # helper structure to find schematics
@@ -42,26 +61,39 @@ def define_building_recipe_to_schematic_mappings():
             unlock_building_by[building_name].add(schematics_name)
     
     return unlock_recipe_by, unlock_building_by
-unlock_recipe_by, unlock_building_by = define_building_recipe_to_schematic_mappings()
+unlock_recipe_by = LazyTable(
+    'unlock_recipe_by',
+    lambda: DATABASE.get_table(
+        'building_recipe_to_schematic_mappings',
+        define_building_recipe_to_schematic_mappings
+    )[0]
+)
+unlock_building_by = LazyTable(
+    'unlock_building_by',
+    lambda: DATABASE.get_table(
+        'building_recipe_to_schematic_mappings',
+        define_building_recipe_to_schematic_mappings
+    )[1]
+)
 
 
 class SchematicFlags(Flags):
     def __init__(self,
                  data: Iterable[str]=[],
-                 omega: Iterable[str]=SCHEMATICS):
+                 omega: Iterable[str]=OMEGA_SCHEMATICS):
         super().__init__(data, omega)
 
     @classmethod
     def from_array(cls,
                    array: np.ndarray,
-                   omega: Iterable[str]=SCHEMATICS
+                   omega: Iterable[str]=OMEGA_SCHEMATICS
                    ) -> 'SchematicFlags':
         return cls._from_array(array, omega)
 
     @classmethod
     def load(cls,
              file_path: os.PathLike,
-             omega: Iterable[str]=SCHEMATICS
+             omega: Iterable[str]=OMEGA_SCHEMATICS
              ) -> 'SchematicFlags':
         return super()._load(file_path, omega)
     
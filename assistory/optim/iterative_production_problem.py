@@ -58,12 +58,7 @@ class IterativeProductionData:
             np.ndarray: matrix A[i,r]: production rate of item i by recipe r
         """
         # production matrix A_i,r: production rate of item i by recipe r
-        A = np.zeros((len(self.items), len(self.recipes_automated)), dtype=float)
-        for r, recipe_name in enumerate(self.recipes_automated):
-            single_recipe = RecipeValues({recipe_name: 1}, omega=self.recipes_automated)
-            item_balance = filter_items(single_recipe.get_item_rate_balance(), self.items)
-            A[:, r] = item_balance.as_array()
-        return A
+        return game.get_item_rate_matrix(self.items, self.recipes_automated).toarray()
 
     def get_recipe_handcrafted_production_matrix(self) -> np.ndarray:
         """
@@ -74,12 +69,9 @@ class IterativeProductionData:
         Returns:
             np.ndarray: matrix A[i,r]: production rate of item i by recipe r
         """
-        A = np.zeros((len(self.items), len(self.recipes_handcraft)), dtype=float)
-        for r, recipe_name in enumerate(self.recipes_handcraft):
-            single_recipe = RecipeValues({recipe_name: 1}, omega=self.recipes_handcraft)
-            item_balance = filter_items(single_recipe.get_item_rate_balance_handcraft(), self.items)
-            A[:, r] = item_balance.as_array()
-        return A
+        return game.get_item_rate_matrix(
+            self.items, self.recipes_handcraft, handcraft=True
+        ).toarray()
 
     def get_recipe_automated_cost_matrix(self) -> np.ndarray:
         """
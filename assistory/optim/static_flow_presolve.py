@@ -0,0 +1,109 @@
+"""
+Remove recipes from a static flow problem that can not be used in any
+feasible solution before the linear program is built.
+
+All item rate balances are bounded below by a nonnegative limit. Therefore, a
+recipe that consumes an item which has no base item rate and is not produced
+by any usable recipe must have a count of 0. Starting with all recipes that are
+not locked by an upper limit of 0, such recipes are removed until a fixed point
+is reached. The result does not change the optimal solution.
+"""
+from dataclasses import dataclass
+from typing import Set, Tuple
+
+import numpy as np
+
+from assistory import game
+from assistory.game import ItemFlags, RecipeFlags
+from assistory.optim.static_flow_problem_config import StaticFlowLPConfig
+
+
+@dataclass
+class StaticFlowPresolveResult:
+
+    # Automated recipes that can be used
+    recipes_active: RecipeFlags
+
+    # Automated recipes that are locked by an upper limit of 0
+    recipes_locked: RecipeFlags
+
+    # Automated recipes that consume items which can not be produced
+    recipes_unreachable: RecipeFlags
+
+    # Items that are neither produced nor consumed by an active recipe
+    items_removed: ItemFlags
+
+    def report(self):
+        print(f'\nPresolve removed {len(self.recipes_locked)} locked and '
+              f'{len(self.recipes_unreachable)} unreachable recipes and '
+              f'{len(self.items_removed)} items. '
+              f'{len(self.recipes_active)} recipes remain.')
+
+
+def _get_recipe_names_locked_and_required(
+        configuration: StaticFlowLPConfig
+    ) -> Tuple[Set[str], Set[str]]:
+    recipe_names_locked = {
+        recipe_name
+        for recipe_name, limit in configuration.recipe_count_upper_limits.items()
+        if limit == 0
+    }
+    for recipe_group, limit in configuration.recipe_group_count_upper_limits.items():
+        if limit == 0:
+            recipe_names_locked.update(recipe_group)
+    # recipes that must be used are kept for the solver to detect infeasibility
+    recipe_names_required = {
+        recipe_name
+        for recipe_name, limit in configuration.recipe_count_lower_limits.items()
+        if limit > 0
+    }
+    for recipe_group, limit in configuration.recipe_group_count_lower_limits.items():
+        if limit > 0:
+            recipe_names_required.update(recipe_group)
+    return recipe_names_locked - recipe_names_required, recipe_names_required
+
+
+def presolve(configuration: StaticFlowLPConfig) -> StaticFlowPresolveResult:
+    """
+    Find the automated recipes that can be used in a feasible solution of the
+    static flow problem by reachability on the item rate matrix.
+
+    Args:
+        configuration (StaticFlowLPConfig): Configuration of the problem
+
+    Returns:
+        StaticFlowPresolveResult: Active and removed recipes and items
+    """
+    recipe_names = game.OMEGA_RECIPES_AUTOMATED
+    item_rate_matrix = game.get_item_rate_matrix(recipe_names=recipe_names)
+    produces = (item_rate_matrix > 0).astype(np.int32)
+    consumes_transposed = (item_rate_matrix < 0).astype(np.int32).T.tocsr()
+
+    recipe_names_locked, recipe_names_required = _get_recipe_names_locked_and_required(
+        configuration
+    )
+    locked = np.array([recipe_name in recipe_names_locked for recipe_name in recipe_names])
+    required = np.array([recipe_name in recipe_names_required for recipe_name in recipe_names])
+
+    base_item_rate = game.ItemValues()
+    base_item_rate.update(configuration.base_item_rate)
+    # items without lower limit of the balance can be consumed without source
+    available = base_item_rate.as_array() > 0
+    available |= ~ItemFlags(configuration.item_rate_balance_lower_limits.keys()).as_array()
+
+    active = ~locked
+    while True:
+        producible = available | (produces @ active.astype(np.int32) > 0)
+        blocked = consumes_transposed @ (~producible).astype(np.int32) > 0
+        active_next = active & (~blocked | required)
+        if np.array_equal(active, active_next):
+            break
+        active = active_next
+
+    used = (abs(item_rate_matrix) @ active.astype(np.float64)) > 0
+    return StaticFlowPresolveResult(
+        recipes_active=RecipeFlags.from_array(active, recipe_names),
+        recipes_locked=RecipeFlags.from_array(locked, recipe_names),
+        recipes_unreachable=RecipeFlags.from_array(~locked & ~active, recipe_names),
+        items_removed=ItemFlags.from_array(~used),
+    )
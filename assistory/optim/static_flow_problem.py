@@ -1,10 +1,14 @@
+import time
 from enum import Enum
-from typing import Optional
+from typing import Callable, Dict, Iterable, List, Optional
 
+import numpy as np
 from ortools.linear_solver import pywraplp
 
 from assistory import game
 from assistory.game import ItemValues, RecipeValues
+from assistory.optim import static_flow_presolve
+from assistory.optim.static_flow_presolve import StaticFlowPresolveResult
 from assistory.optim.static_flow_problem_config import StaticFlowLPConfig
 
 
@@ -27,131 +31,328 @@ def get_solution_value(x):
 
 class StaticFlowLP:
     """
-    Linear problem of the item flow between automated recipes.
+    Linear problem of the item flow between automated recipes. The problem
+    can be updated with a new configuration and solved again, which reuses
+    the previous basis of the solver as warm start.
     """
 
-    def __init__(self, configuration: StaticFlowLPConfig):
+    def __init__(self, configuration: StaticFlowLPConfig, presolve: bool=True):
+        """
+        Create the linear problem
+
+        Args:
+            configuration (StaticFlowLPConfig): Configuration of the problem
+            presolve (bool, optional): Only create variables for recipes that
+                can be used in a feasible solution. Defaults to True.
+        """
+        start_time = time.perf_counter()
         configuration.check()
 
         self.objective_value: Optional[float] = None
+        # duration of building and solving the model in seconds
+        self.build_time: Optional[float] = None
+        self.solve_time: Optional[float] = None
 
         self.solver = pywraplp.Solver.CreateSolver("GLOP")
         if not self.solver:
             raise RuntimeError("Could not create GLOB solver")
         pywraplp.Solver.SetSolverSpecificParametersAsString(self.solver, "use_dual_simplex:1")
-        
-        # variable to optimize are the utilization of each recipe
-        self.var_recipes_used = RecipeValues(
-            {
-                recipe_name: self.solver.NumVar(0, self.solver.infinity(), recipe_name)
-                for recipe_name in game.RECIPE_NAMES_AUTOMATED
-            },
-            omega=game.RECIPE_NAMES_AUTOMATED
-        )
+        self._infinity = self.solver.infinity()
+
+        # variable to optimize are the utilization of each recipe. Recipes
+        # removed by the presolve have no variable and a count of 0
+        self._presolve = presolve
+        self.presolve_result: Optional[StaticFlowPresolveResult] = None
+        self.var_recipes_used = RecipeValues(omega=game.RECIPE_NAMES_AUTOMATED)
+        self._variables: List[Optional[pywraplp.Variable]] = [None] * len(self.var_recipes_used)
+        self._ratio_factor = self.solver.NumVar(0, self._infinity, 'Ratio_factor')
 
-        # define helper terms
-        self.item_balance = (
-            self.var_recipes_used.get_item_rate_balance() + configuration.base_item_rate
+        # item rate balance = A @ var_recipes_used + base_item_rate. The
+        # coefficients of the constraints are set from the sparse rows of A
+        self._item_rate_matrix = game.get_item_rate_matrix(
+            recipe_names=self.var_recipes_used.keys()
         )
+        self._base_item_rate = ItemValues()
+        # constraints and functions returning their coefficients by name
+        self._constraints: Dict[str, pywraplp.Constraint] = dict()
+        self._constraint_coefficients: Dict[str, Callable[[], Dict[pywraplp.Variable, float]]] = dict()
+
+        self._set_configuration(configuration)
+        self.build_time = time.perf_counter() - start_time
+
+    def update(self, configuration: StaticFlowLPConfig):
+        """
+        Change the problem to the new configuration in place. Bounds, right
+        hand sides and objective coefficients are updated and only missing
+        constraints are added. The next call of optimize starts from the
+        previous solution.
+
+        Args:
+            configuration (StaticFlowLPConfig): New configuration
+        """
+        configuration.check()
+        self._set_configuration(configuration)
+
+    def _add_variables(self, recipe_names: Iterable[str]):
+        # add missing variables and their coefficients in existing constraints
+        variables_new = []
+        for r, recipe_name in enumerate(self.var_recipes_used.keys()):
+            if self._variables[r] is None and recipe_name in recipe_names:
+                variable = self.solver.NumVar(0, self._infinity, recipe_name)
+                self._variables[r] = variable
+                self.var_recipes_used[recipe_name] = variable
+                variables_new.append(variable)
+        if not variables_new or not self._constraints:
+            return
+        for name, constraint in self._constraints.items():
+            coefficients = self._constraint_coefficients[name]()
+            for variable in variables_new:
+                if variable in coefficients:
+                    constraint.SetCoefficient(variable, coefficients[variable])
+
+    def _set_configuration(self, configuration: StaticFlowLPConfig):
+        infinity = self._infinity
+        if self._presolve:
+            self.presolve_result = static_flow_presolve.presolve(configuration)
+            self._add_variables(self.presolve_result.recipes_active)
+        else:
+            self._add_variables(self.var_recipes_used.keys())
+        self._base_item_rate.set_values(0)
+        self._base_item_rate.update(configuration.base_item_rate)
 
         # constraint: limits for item balance
         for item_name, limit in configuration.item_rate_balance_upper_limits.items():
-            if limit == float('inf'):
-                continue
-            self.solver.Add(
-                self.item_balance[item_name] <= limit,
+            self._set_item_rate_balance_constraint(
+                item_name,
+                -infinity,
+                limit,
                 f'Upper_item_rate_balance_limit_{item_name}'
             )
         for item_name, limit in configuration.item_rate_balance_lower_limits.items():
-            self.solver.Add(
-                self.item_balance[item_name] >= limit,
+            self._set_item_rate_balance_constraint(
+                item_name,
+                limit,
+                infinity,
                 f'Lower_item_rate_balance_limit_{item_name}'
             )
 
         # constraint: item rate balance ratio
-        ratio_factor = self.solver.NumVar(0, self.solver.infinity(), 'Ratio_factor')
         for item_name, ratio in configuration.item_rate_balance_ratio.items():
-            if ratio == 0:
-                continue
-            self.solver.Add(
-                self.item_balance[item_name] == ratio * ratio_factor,
+            constraint = self._set_item_rate_balance_constraint(
+                item_name,
+                0 if ratio != 0 else -infinity,
+                0 if ratio != 0 else infinity,
                 f'Item_rate_balance_ratio_{item_name}'
             )
+            if constraint is not None:
+                constraint.SetCoefficient(self._ratio_factor, -ratio)
 
         # constraint: limits for recipe count
         for recipe_name, limit in configuration.recipe_count_upper_limits.items():
-            if limit == float('inf'):
-                continue
-            self.solver.Add(
-                self.var_recipes_used[recipe_name] <= limit,
+            self._set_recipe_constraint(
+                {recipe_name: 1},
+                -infinity,
+                limit,
                 f'Upper_recipe_count_limit_{recipe_name}'
             )
         for recipe_name, limit in configuration.recipe_count_lower_limits.items():
-            if limit == 0:
-                continue
-            self.solver.Add(
-                self.var_recipes_used[recipe_name] >= limit,
+            self._set_recipe_constraint(
+                {recipe_name: 1},
+                limit if limit != 0 else -infinity,
+                infinity,
                 f'Lower_recipe_count_limit_{recipe_name}'
             )
 
         # constraint: limits for recipe count
         for recipe_group, limit in configuration.recipe_group_count_upper_limits.items():
-            recipe_group_count = sum(
-                self.var_recipes_used[recipe_name]
-                for recipe_name in recipe_group
-            )
-            self.solver.Add(
-                recipe_group_count <= limit,
+            self._set_recipe_constraint(
+                {recipe_name: 1 for recipe_name in recipe_group},
+                -infinity,
+                limit,
                 f'Upper_recipe_group_count_limit_{recipe_group}'
             )
         for recipe_group, limit in configuration.recipe_group_count_lower_limits.items():
-            recipe_group_count = sum(
-                self.var_recipes_used[recipe_name]
-                for recipe_name in recipe_group
-            )
-            self.solver.Add(
-                recipe_group_count >= limit,
+            self._set_recipe_constraint(
+                {recipe_name: 1 for recipe_name in recipe_group},
+                limit,
+                infinity,
                 f'Lower_recipe_group_count_limit_{recipe_group}'
             )
 
+        # release limits of the previous configuration that are not defined anymore
+        names_defined = {
+            f'Upper_recipe_group_count_limit_{recipe_group}'
+            for recipe_group in configuration.recipe_group_count_upper_limits
+        } | {
+            f'Lower_recipe_group_count_limit_{recipe_group}'
+            for recipe_group in configuration.recipe_group_count_lower_limits
+        }
+        for name, constraint in self._constraints.items():
+            if name.startswith(('Upper_recipe_group_count_limit_',
+                                'Lower_recipe_group_count_limit_')
+                               ) and not name in names_defined:
+                constraint.SetBounds(-infinity, infinity)
+
+        objective = self.solver.Objective()
+        objective.Clear()
         # objective: recipe count
         if configuration.minimize_recipe_count or configuration.maximize_recipe_count:
-            objective = sum(
-                weight * self.var_recipes_used[recipe_name]
-                for recipe_name, weight in configuration.recipe_weights.items()
-                if weight > 0 # speed up by excluding; formula unchanged
-            )
+            for recipe_name, weight in configuration.recipe_weights.items():
+                variable = self.var_recipes_used[recipe_name]
+                if weight > 0 and variable is not 0: # speed up by excluding; formula unchanged
+                    objective.SetCoefficient(variable, weight)
             if configuration.minimize_recipe_count:
-                self.solver.Minimize(objective)
+                objective.SetMinimization()
             elif configuration.maximize_recipe_count:
-                self.solver.Maximize(objective)
+                objective.SetMaximization()
         
         # objective: item rate balance
         elif configuration.minimize_item_rate_balance or configuration.maximize_item_rate_balance:
-            objective = sum(
-                weight * self.item_balance[item_name]
-                for item_name, weight in configuration.item_weights.items()
-                if weight > 0 # speed up by excluding; formula unchanged
-            )
+            item_weights = ItemValues()
+            for item_name, weight in configuration.item_weights.items():
+                if weight > 0: # speed up by excluding; formula unchanged
+                    item_weights[item_name] = weight
+            item_weights = item_weights.as_array()
+            # weights @ (A @ x + base) = (weights @ A) @ x + weights @ base
+            coefficients = self._item_rate_matrix.T @ item_weights
+            for r in np.flatnonzero(coefficients).tolist():
+                if self._variables[r] is not None:
+                    objective.SetCoefficient(self._variables[r], coefficients[r])
+            objective.SetOffset(float(item_weights @ self._base_item_rate.as_array()))
             if configuration.minimize_item_rate_balance:
-                self.solver.Minimize(objective)
+                objective.SetMinimization()
             elif configuration.maximize_item_rate_balance:
-                self.solver.Maximize(objective)
-        
+                objective.SetMaximization()
+
+    def _set_constraint(
+            self,
+            lower_bound: float,
+            upper_bound: float,
+            name: str,
+            get_coefficients: Callable[[], Dict[pywraplp.Variable, float]]
+        ) -> Optional[pywraplp.Constraint]:
+        # Update the bounds of an existing constraint. A new constraint is
+        # only created if it restricts the problem.
+        constraint = self._constraints.get(name)
+        if constraint is not None:
+            constraint.SetBounds(lower_bound, upper_bound)
+            return constraint
+        if lower_bound == -self._infinity and upper_bound == self._infinity:
+            return None
+        coefficients = get_coefficients()
+        if not coefficients and lower_bound <= 0 <= upper_bound:
+            return None
+        constraint = self.solver.Constraint(lower_bound, upper_bound, name)
+        for variable, coefficient in coefficients.items():
+            constraint.SetCoefficient(variable, coefficient)
+        self._constraints[name] = constraint
+        self._constraint_coefficients[name] = get_coefficients
+        return constraint
+
+    def _set_item_rate_balance_constraint(
+            self,
+            item_name: str,
+            lower_bound: float,
+            upper_bound: float,
+            name: str
+        ) -> Optional[pywraplp.Constraint]:
+        # lower_bound <= A[i] @ x + base[i] <= upper_bound
+        def get_coefficients():
+            i = game.OMEGA_ITEMS.index[item_name]
+            start, stop = self._item_rate_matrix.indptr[i:i+2]
+            return {
+                self._variables[r]: coefficient
+                for r, coefficient in zip(
+                    self._item_rate_matrix.indices[start:stop].tolist(),
+                    self._item_rate_matrix.data[start:stop].tolist()
+                )
+                if self._variables[r] is not None
+            }
+        base = self._base_item_rate[item_name]
+        return self._set_constraint(
+            lower_bound - base,
+            upper_bound - base,
+            name,
+            get_coefficients
+        )
+
+    def _get_recipe_coefficients(
+            self,
+            coefficients: Dict[str, float]
+        ) -> Dict[pywraplp.Variable, float]:
+        variable_coefficients = dict()
+        for recipe_name, coefficient in coefficients.items():
+            variable = self.var_recipes_used[recipe_name]
+            if coefficient == 0 or variable is 0: # removed by presolve
+                continue
+            variable_coefficients[variable] = (
+                variable_coefficients.get(variable, 0) + coefficient
+            )
+        return variable_coefficients
+
+    def _set_recipe_constraint(
+            self,
+            coefficients: Dict[str, float],
+            lower_bound: float,
+            upper_bound: float,
+            name: str
+        ) -> Optional[pywraplp.Constraint]:
+        return self._set_constraint(
+            lower_bound,
+            upper_bound,
+            name,
+            lambda: self._get_recipe_coefficients(coefficients)
+        )
+
+    def add_recipe_constraint(
+            self,
+            coefficients: Dict[str, float],
+            lower_bound: float,
+            upper_bound: float,
+            name: str
+        ) -> pywraplp.Constraint:
+        """
+        Add the linear constraint lower_bound <= sum of coefficient times
+        recipe count <= upper_bound. Its bounds can be changed later with
+        SetBounds.
+
+        Args:
+            coefficients (Dict[str, float]): Coefficient by automated recipe
+                name. Recipes with coefficient 0 are skipped.
+            lower_bound (float): Lower bound. Can be -infinity
+            upper_bound (float): Upper bound. Can be infinity
+            name (str): Unique name of the constraint
+
+        Returns:
+            pywraplp.Constraint: The constraint
+        """
+        if name in self._constraints:
+            raise ValueError(f'Constraint {name} already exists')
+        get_coefficients = lambda: self._get_recipe_coefficients(coefficients)
+        constraint = self.solver.Constraint(lower_bound, upper_bound, name)
+        for variable, coefficient in get_coefficients().items():
+            constraint.SetCoefficient(variable, coefficient)
+        self._constraints[name] = constraint
+        self._constraint_coefficients[name] = get_coefficients
+        return constraint
+
     def optimize(self) -> ReturnCode:
-        """Find the optimal solution for the problem.
+        """Find the optimal solution for the problem. Can be called again
+        after an update of the problem.
 
         Returns:
             ReturnCode: Solver return code
         """
-        if self.objective_value != None:
-            raise RuntimeError('Problem already optimized')
         if DEBUG:
             print("Number of variables =", self.solver.NumVariables())
             print("Number of constraints =", self.solver.NumConstraints())
+        start_time = time.perf_counter()
         code = ReturnCode(self.solver.Solve())
+        self.solve_time = time.perf_counter() - start_time
         if code == ReturnCode.OPTIMAL:
             self.objective_value = self.solver.Objective().Value()
+        else:
+            self.objective_value = None
         return code
     
     def get_recipes_used(self) -> RecipeValues:
@@ -163,7 +364,7 @@ class StaticFlowLP:
         """
         return RecipeValues(
             {
-                recipe_name: variable.solution_value()
+                recipe_name: get_solution_value(variable)
                 for recipe_name, variable in self.var_recipes_used.items()
             },
             omega=game.RECIPE_NAMES_AUTOMATED
@@ -176,10 +377,13 @@ class StaticFlowLP:
         Returns:
             ItemAmounts: Item rate balance by item name
         """
-        return ItemValues({
-            item_name: get_solution_value(self.item_balance[item_name])
-            for item_name in game.ITEMS
-        })
+        recipes_used = np.array([
+            0 if variable is None else variable.solution_value()
+            for variable in self._variables
+        ])
+        return ItemValues.from_array(
+            self._item_rate_matrix @ recipes_used + self._base_item_rate.as_array()
+        )
 
     def report_solution_value(self):
         print('\nSolution value:')
@@ -202,4 +406,5 @@ class StaticFlowLP:
 
     def report(self):
         print(f"\nObjective value = {round(self.solver.Objective().Value(), 3)}")
-        print(f"\nProblem solved in {self.solver.wall_time():d} milliseconds")
+        print(f"\nProblem built in {self.build_time * 1000:.0f} milliseconds")
+        print(f"Problem solved in {self.solve_time * 1000:.0f} milliseconds")
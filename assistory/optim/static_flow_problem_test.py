@@ -125,6 +125,35 @@ class TestStaticFlowLP(unittest.TestCase):
         code = lp.optimize()
         self.assertEqual(static_flow_problem.ReturnCode.OPTIMAL, code)
 
+    def test_item_rate_balance_with_base_item_rate(self):
+        recipe_count_limit = RecipeValues(omega=game.RECIPE_NAMES_AUTOMATED)
+        recipe_count_limit['Recipe_AILimiter_C'] = 1.23
+        base_item_rate = ItemValues({
+            "Desc_CopperSheet_C": 500,
+			"Desc_HighSpeedWire_C": 2000,
+        })
+        flow_conf = StaticFlowLPConfig(
+            minimize_item_rate_balance=True,
+            item_weights=ItemValues({"Desc_CopperSheet_C": 1}),
+            base_item_rate=base_item_rate,
+            recipe_count_upper_limits=recipe_count_limit,
+            recipe_count_lower_limits=recipe_count_limit,
+        )
+        lp = static_flow_problem.StaticFlowLP(flow_conf)
+        self.assertGreater(lp.build_time, 0)
+        code = lp.optimize()
+        self.assertEqual(static_flow_problem.ReturnCode.OPTIMAL, code)
+        self.assertGreater(lp.solve_time, 0)
+        expected = lp.get_recipes_used().get_item_rate_balance() + base_item_rate
+        item_rate_balance = lp.get_item_rate_balance()
+        for item_name in game.ITEMS:
+            self.assertAlmostEqual(expected[item_name], item_rate_balance[item_name])
+        # objective includes the base item rate
+        self.assertAlmostEqual(
+            lp.objective_value,
+            item_rate_balance['Desc_CopperSheet_C']
+        )
+
 
 # Run the tests
 if __name__ == '__main__':
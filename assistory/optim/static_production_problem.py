@@ -2,6 +2,7 @@
 Create an optimal production, i.e. amounts of recipes, given an objective
 and constraints using linear optimization.
 """
+import time
 from typing import Optional
 
 from assistory import game
@@ -26,10 +27,50 @@ class StaticProductionLP:
             production_lp_config (StaticProductionLPConfig): Configuration of
                 the static production linear program
         """
+        start_time = time.perf_counter()
         production_lp_config.check()
 
         self.objective_value: Optional[float] = None
 
+        # instantiate problem here to add custom constraints later
+        flow_lp_config = self._get_flow_lp_config(production_lp_config)
+        self.problem = static_flow_problem.StaticFlowLP(flow_lp_config)
+
+        # power constraints: base power + power balance of the recipes >= 0
+        power_balance = {
+            recipe_name: sum(
+                -game.BUILDINGS[building_name]['power_consumption']
+                for building_name in game.RECIPES[recipe_name]['producedIn']
+            )
+            for recipe_name in game.RECIPE_NAMES_AUTOMATED
+        }
+        self._power_constraint = self.problem.add_recipe_constraint(
+            power_balance,
+            -production_lp_config.base_power,
+            self.problem.solver.infinity(),
+            'Power_balance'
+        )
+        # build time of the whole production problem
+        self.problem.build_time = time.perf_counter() - start_time
+
+    def update(self, production_lp_config: StaticProductionLPConfig):
+        """
+        Change the problem to the new configuration in place, e.g. base
+        power, sell rate lower limits, available resource nodes, unlocked
+        recipes or objective weights. The next call of optimize starts from
+        the previous solution.
+
+        Args:
+            production_lp_config (StaticProductionLPConfig): New configuration
+        """
+        production_lp_config.check()
+        self.problem.update(self._get_flow_lp_config(production_lp_config))
+        self._power_constraint.SetLb(-production_lp_config.base_power)
+
+    def _get_flow_lp_config(
+            self,
+            production_lp_config: StaticProductionLPConfig
+        ) -> StaticFlowLPConfig:
         self._objective_specific_report = lambda: None
 
         flow_lp_config = StaticFlowLPConfig()
@@ -90,16 +131,7 @@ class StaticProductionLP:
             flow_lp_config.item_weights = production_lp_config.weights_sell_rate.copy()
             self._objective_specific_report = self._report_sold_items
 
-        # instantiate problem here to add custom constraints later
-        self.problem = static_flow_problem.StaticFlowLP(flow_lp_config)
-
-        # power constraints
-        buildings_used = self.problem.var_recipes_used.get_buildings()
-        power_balance = buildings_used.get_power_balance()
-        self.problem.solver.Add(
-            production_lp_config.base_power + power_balance >= 0,
-            'Power_balance'
-        )
+        return flow_lp_config
 
     def get_recipes_used(self) -> RecipeValues:
         return self.problem.get_recipes_used()
@@ -113,11 +145,8 @@ class StaticProductionLP:
         Returns:
             ReturnCode: Solver return code
         """
-        if self.objective_value != None:
-            raise RuntimeError('Problem already optimized')
         code = self.problem.optimize()
-        if code == ReturnCode.OPTIMAL:
-            self.objective_value = self.problem.objective_value
+        self.objective_value = self.problem.objective_value
         return code
 
     ################################### report ###############################
@@ -160,6 +160,39 @@ class TestStaticFlowLP(unittest.TestCase):
         self.assertAlmostEqual(production['Recipe_Alternate_PureIronIngot_C'], 0.0)
         self.assertGreater(production['Recipe_IngotIron_C'], 0.1)
 
+    def test_update_resolve(self):
+        def get_config(base_power, unlocked_recipes, iron_ore_nodes, weights_sell_rate):
+            return StaticProductionLPConfig(
+                unlocked_recipes=unlocked_recipes,
+                available_resource_nodes=ResourceNodeValues({
+                    game.get_resource_node_name('Desc_OreIron_C', False): iron_ore_nodes,
+                }),
+                base_power=base_power,
+                maximize_sell_rate=True,
+                weights_sell_rate=ItemValues(weights_sell_rate),
+            )
+        recipes = {
+            'Recipe_MinerMk1OreIron_C',
+            'Recipe_IngotIron_C',
+            'Recipe_Alternate_PureIronIngot_C',
+            'Recipe_WaterPumpWater_C',
+        }
+        configs = [
+            get_config(10.0, recipes, 1.0, {'Desc_IronIngot_C': 1}),
+            get_config(1000.0, recipes, 1.0, {'Desc_IronIngot_C': 1}),
+            get_config(1000.0, recipes, 2.0, {'Desc_IronIngot_C': 1}),
+            get_config(1000.0, recipes - {'Recipe_Alternate_PureIronIngot_C'}, 2.0, {'Desc_IronIngot_C': 1}),
+            get_config(1000.0, recipes, 2.0, {'Desc_OreIron_C': 1}),
+        ]
+        lp = static_production_problem.StaticProductionLP(configs[0])
+        for lp_config in configs:
+            lp.update(lp_config)
+            code = lp.optimize()
+            self.assertEqual(code, ReturnCode.OPTIMAL)
+            lp_new = static_production_problem.StaticProductionLP(lp_config)
+            self.assertEqual(lp_new.optimize(), ReturnCode.OPTIMAL)
+            self.assertAlmostEqual(lp.objective_value, lp_new.objective_value)
+
 
 # Run the tests
 if __name__ == '__main__':
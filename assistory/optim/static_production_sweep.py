@@ -0,0 +1,317 @@
+"""
+Solve a grid of scenarios of a static production problem, e.g. the optimal
+sink point rate for different power budgets, fractions of resource nodes and
+sets of unlocked alternate recipes. The scenarios are distributed over a
+process pool and the results are streamed to a CSV or NDJSON file.
+"""
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import yaml
+
+from assistory import game
+from assistory.game import RecipeFlags
+from assistory.optim.static_production_problem import StaticProductionLP
+from assistory.optim.static_production_problem_config import StaticProductionLPConfig
+
+
+# Key of the scenario parameter scaling all resource nodes
+ALL_RESOURCE_NODES = 'all'
+
+# Columns of a result additionally to the scenario parameters
+RESULT_COLUMNS = ('scenario', 'status', 'objective_value', 'solve_time')
+
+
+@dataclass
+class StaticProductionSweepConfig:
+
+    # File containing the StaticProductionLPConfig all scenarios are based on
+    static_production_config_file: str
+
+    # Values of base_power in MW. Defaults to [] which keeps the base_power of
+    # the static production config.
+    base_power: List[float] = field(default_factory=list)
+
+    # Fractions of the available resource nodes by resource node name. Each
+    # entry is an axis of the grid. Use the key ALL_RESOURCE_NODES to scale
+    # all resource nodes at once. Defaults to {}.
+    resource_node_fractions: Dict[str, List[float]] = field(default_factory=dict)
+
+    # Named sets of unlocked alternate recipes. In each scenario, all
+    # alternate recipes except for the set are locked. Defaults to {} which
+    # keeps the unlocked recipes of the static production config.
+    alternate_recipe_sets: Dict[str, List[str]] = field(default_factory=dict)
+
+    def check(self):
+        for resource_node_name, fractions in self.resource_node_fractions.items():
+            if (resource_node_name != ALL_RESOURCE_NODES
+                and not resource_node_name in game.RESOURCE_NODES):
+                raise ValueError(f'Unknown resource node: {resource_node_name}')
+            if any(fraction < 0 for fraction in fractions):
+                raise ValueError('Resource node fractions can not be negative')
+        for set_name, recipe_names in self.alternate_recipe_sets.items():
+            unknown = set(recipe_names) - game.RECIPE_NAMES_ALTERNATE
+            if unknown:
+                raise ValueError(f'Not an alternate recipe in {set_name}: {unknown}')
+
+    def load_static_production_config(self) -> StaticProductionLPConfig:
+        return StaticProductionLPConfig.load_from_file(
+            self.static_production_config_file
+        )
+
+    def get_parameter_names(self) -> List[str]:
+        """
+        Return the names of the scenario parameters in a fixed order
+
+        Returns:
+            List[str]: Parameter names
+        """
+        parameter_names = []
+        if self.base_power:
+            parameter_names.append('base_power')
+        for resource_node_name in self.resource_node_fractions:
+            parameter_names.append(f'resource_nodes:{resource_node_name}')
+        if self.alternate_recipe_sets:
+            parameter_names.append('alternate_recipes')
+        return parameter_names
+
+    def get_scenarios(self) -> List[Dict[str, Any]]:
+        """
+        Return all scenarios of the grid. A scenario maps each parameter name
+        to its value.
+
+        Returns:
+            List[Dict[str, Any]]: Scenarios
+        """
+        axes = []
+        if self.base_power:
+            axes.append(self.base_power)
+        for fractions in self.resource_node_fractions.values():
+            axes.append(fractions)
+        if self.alternate_recipe_sets:
+            axes.append(list(self.alternate_recipe_sets))
+        parameter_names = self.get_parameter_names()
+        return [
+            dict(zip(parameter_names, values))
+            for values in itertools.product(*axes)
+        ]
+
+    @staticmethod
+    def load_from_file(file_path: str) -> 'StaticProductionSweepConfig':
+        with open(file_path, 'r') as fp:
+            config_data = yaml.safe_load(fp)
+        config = StaticProductionSweepConfig(**config_data)
+        config.check()
+        return config
+
+
+def get_scenario_key(scenario: Dict[str, Any]) -> str:
+    """
+    Return a unique string of the scenario to identify solved scenarios.
+
+    Args:
+        scenario (Dict[str, Any]): Scenario
+
+    Returns:
+        str: Key of the scenario
+    """
+    return json.dumps(scenario, sort_keys=True, separators=(',', ':'))
+
+
+def apply_scenario(
+        base_config: StaticProductionLPConfig,
+        scenario: Dict[str, Any],
+        alternate_recipe_sets: Dict[str, List[str]]
+    ) -> StaticProductionLPConfig:
+    """
+    Return the configuration of a scenario.
+
+    Args:
+        base_config (StaticProductionLPConfig): Configuration all scenarios
+            are based on
+        scenario (Dict[str, Any]): Scenario
+        alternate_recipe_sets (Dict[str, List[str]]): Named sets of unlocked
+            alternate recipes
+
+    Returns:
+        StaticProductionLPConfig: Configuration of the scenario
+    """
+    config = replace(
+        base_config,
+        available_resource_nodes=base_config.available_resource_nodes.copy()
+    )
+    for parameter_name, value in scenario.items():
+        if parameter_name == 'base_power':
+            config.base_power = value
+        elif parameter_name.startswith('resource_nodes:'):
+            resource_node_name = parameter_name[len('resource_nodes:'):]
+            if resource_node_name == ALL_RESOURCE_NODES:
+                config.available_resource_nodes *= value
+            else:
+                config.available_resource_nodes[resource_node_name] *= value
+        elif parameter_name == 'alternate_recipes':
+            config.unlocked_recipes = RecipeFlags(
+                (set(base_config.unlocked_recipes) - game.RECIPE_NAMES_ALTERNATE)
+                | set(alternate_recipe_sets[value])
+            )
+        else:
+            raise ValueError(f'Unknown scenario parameter: {parameter_name}')
+    return config
+
+
+# state of a worker process: problem is reused for all its scenarios
+_worker_base_config: Optional[StaticProductionLPConfig] = None
+_worker_alternate_recipe_sets: Dict[str, List[str]] = dict()
+_worker_problem: Optional[StaticProductionLP] = None
+
+
+def _init_worker(
+        base_config: StaticProductionLPConfig,
+        alternate_recipe_sets: Dict[str, List[str]]
+    ):
+    # load the game data and build the problem once per worker
+    global _worker_base_config, _worker_alternate_recipe_sets, _worker_problem
+    _worker_base_config = base_config
+    _worker_alternate_recipe_sets = alternate_recipe_sets
+    _worker_problem = StaticProductionLP(base_config)
+
+
+def _solve_scenario(scenario: Dict[str, Any]) -> Dict[str, Any]:
+    config = apply_scenario(
+        _worker_base_config,
+        scenario,
+        _worker_alternate_recipe_sets
+    )
+    start_time = time.perf_counter()
+    # warm start from the previous scenario of the worker
+    _worker_problem.update(config)
+    code = _worker_problem.optimize()
+    result = {'scenario': get_scenario_key(scenario)}
+    result.update(scenario)
+    result['status'] = code.name
+    result['objective_value'] = _worker_problem.objective_value
+    result['solve_time'] = time.perf_counter() - start_time
+    return result
+
+
+class _ResultWriter:
+
+    def __init__(self, out_file: Path, columns: List[str], append: bool):
+        self.out_file = out_file
+        self.columns = columns
+        write_header = not append or not out_file.exists() or out_file.stat().st_size == 0
+        self._fp = open(out_file, 'a' if append else 'w', newline='')
+        if self._is_csv():
+            self._writer = csv.DictWriter(self._fp, fieldnames=columns)
+            if write_header:
+                self._writer.writeheader()
+
+    def _is_csv(self) -> bool:
+        return self.out_file.suffix.lower() == '.csv'
+
+    def write(self, result: Dict[str, Any]):
+        if self._is_csv():
+            self._writer.writerow(result)
+        else:
+            self._fp.write(json.dumps(result) + '\n')
+        self._fp.flush()
+
+    def close(self):
+        self._fp.close()
+
+
+def read_solved_scenario_keys(out_file: os.PathLike) -> Set[str]:
+    """
+    Return the keys of the scenarios in an existing result file. An
+    incomplete last line of an interrupted sweep is removed from the file.
+
+    Args:
+        out_file (os.PathLike): CSV or NDJSON result file
+
+    Returns:
+        Set[str]: Keys of the solved scenarios
+    """
+    out_file = Path(out_file)
+    if not out_file.exists():
+        return set()
+    with open(out_file, 'rb+') as fp:
+        content = fp.read()
+        if content and not content.endswith(b'\n'):
+            fp.truncate(content.rfind(b'\n') + 1)
+    with open(out_file, 'r', newline='') as fp:
+        if out_file.suffix.lower() == '.csv':
+            return {row['scenario'] for row in csv.DictReader(fp)}
+        return {
+            json.loads(line)['scenario']
+            for line in fp
+            if line.strip()
+        }
+
+
+def run_sweep(
+        sweep_config: StaticProductionSweepConfig,
+        out_file: os.PathLike,
+        processes: Optional[int]=None,
+        resume: bool=False,
+        progress: Optional[Callable[[int, int], None]]=None,
+    ) -> int:
+    """
+    Solve all scenarios of the sweep and write one result per line to the
+    output file. Results are written in order of completion.
+
+    Args:
+        sweep_config (StaticProductionSweepConfig): Sweep configuration
+        out_file (os.PathLike): Output file. CSV if the suffix is .csv,
+            otherwise NDJSON.
+        processes (Optional[int], optional): Number of worker processes.
+            Solve in this process if 1. Defaults to None, i.e. the number of
+            CPUs.
+        resume (bool, optional): Skip scenarios that are already in the
+            output file and append the others. Defaults to False.
+        progress (Optional[Callable[[int, int], None]], optional): Called
+            with the number of solved and all scenarios after each result.
+            Defaults to None.
+
+    Returns:
+        int: Number of scenarios solved in this run
+    """
+    sweep_config.check()
+    out_file = Path(out_file)
+    base_config = sweep_config.load_static_production_config()
+    scenarios = sweep_config.get_scenarios()
+    solved_keys = read_solved_scenario_keys(out_file) if resume else set()
+    open_scenarios = [
+        scenario
+        for scenario in scenarios
+        if not get_scenario_key(scenario) in solved_keys
+    ]
+
+    columns = [RESULT_COLUMNS[0]] + sweep_config.get_parameter_names() + list(RESULT_COLUMNS[1:])
+    writer = _ResultWriter(out_file, columns, append=resume)
+    n_done = len(scenarios) - len(open_scenarios)
+    init_args = (base_config, sweep_config.alternate_recipe_sets)
+    pool = None
+    try:
+        if processes == 1:
+            _init_worker(*init_args)
+            results = map(_solve_scenario, open_scenarios)
+        else:
+            pool = multiprocessing.Pool(processes, _init_worker, init_args)
+            results = pool.imap_unordered(_solve_scenario, open_scenarios)
+        for result in results:
+            writer.write(result)
+            n_done += 1
+            if progress is not None:
+                progress(n_done, len(scenarios))
+    finally:
+        if pool is not None:
+            pool.terminate()
+        writer.close()
+    return len(open_scenarios)
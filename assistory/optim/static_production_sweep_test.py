@@ -0,0 +1,92 @@
+import unittest
+import sys, os
+import csv
+import json
+import tempfile
+from pathlib import Path
+
+print('Add', os.getcwd(), 'to path')
+sys.path.append(os.getcwd())
+from assistory.optim import static_production_problem
+from assistory.optim.static_production_sweep import (
+    StaticProductionSweepConfig,
+    apply_scenario,
+    run_sweep,
+)
+
+
+STATIC_PRODUCTION_CONFIG_FILE = 'example/example_configurations/static_production_config.yml'
+
+
+class TestStaticProductionSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.sweep_config = StaticProductionSweepConfig(
+            static_production_config_file=STATIC_PRODUCTION_CONFIG_FILE,
+            base_power=[100, 180],
+            resource_node_fractions={'Desc_OreIron_C-non_fracking': [0.5, 1.0]},
+            alternate_recipe_sets={
+                'none': [],
+                'steel': ['Recipe_Alternate_IngotSteel_1_C'],
+            },
+        )
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_scenarios(self):
+        scenarios = self.sweep_config.get_scenarios()
+        self.assertEqual(8, len(scenarios))
+        base_config = self.sweep_config.load_static_production_config()
+        config = apply_scenario(
+            base_config,
+            scenarios[1],
+            self.sweep_config.alternate_recipe_sets
+        )
+        self.assertEqual(100, config.base_power)
+        self.assertAlmostEqual(
+            0.5 * base_config.available_resource_nodes['Desc_OreIron_C-non_fracking'],
+            config.available_resource_nodes['Desc_OreIron_C-non_fracking']
+        )
+        self.assertIn('Recipe_Alternate_IngotSteel_1_C', config.unlocked_recipes)
+        self.assertNotIn('Recipe_Alternate_SteelRod_C', config.unlocked_recipes)
+
+    def test_results_equal_single_solves(self):
+        out_file = Path(self.tmp_dir.name) / 'results.ndjson'
+        n_solved = run_sweep(self.sweep_config, out_file, processes=2)
+        self.assertEqual(8, n_solved)
+        with open(out_file, 'r') as fp:
+            results = [json.loads(line) for line in fp]
+        self.assertEqual(8, len(results))
+        base_config = self.sweep_config.load_static_production_config()
+        for result in results:
+            scenario = json.loads(result['scenario'])
+            lp = static_production_problem.StaticProductionLP(apply_scenario(
+                base_config,
+                scenario,
+                self.sweep_config.alternate_recipe_sets
+            ))
+            lp.optimize()
+            self.assertAlmostEqual(lp.objective_value, result['objective_value'])
+
+    def test_resume(self):
+        out_file = Path(self.tmp_dir.name) / 'results.csv'
+        run_sweep(self.sweep_config, out_file, processes=1)
+        # interrupted sweep with an incomplete last line
+        with open(out_file, 'r') as fp:
+            lines = fp.readlines()
+        with open(out_file, 'w') as fp:
+            fp.writelines(lines[:4])
+            fp.write(lines[4][:10])
+        n_solved = run_sweep(self.sweep_config, out_file, processes=1, resume=True)
+        self.assertEqual(5, n_solved)
+        with open(out_file, 'r', newline='') as fp:
+            rows = list(csv.DictReader(fp))
+        self.assertEqual(8, len(rows))
+        self.assertEqual(8, len({row['scenario'] for row in rows}))
+
+
+# Run the tests
+if __name__ == '__main__':
+    unittest.main()
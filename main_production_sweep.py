@@ -0,0 +1,64 @@
+from argparse import ArgumentParser
+import sys
+import time
+
+from assistory.optim.static_production_sweep import StaticProductionSweepConfig, run_sweep
+
+
+def main(
+        sweep_config: StaticProductionSweepConfig,
+        out_file: str,
+        processes: int=None,
+        resume: bool=False,
+):
+    start_time = time.perf_counter()
+    last_report = [0.0]
+
+    def report_progress(n_done: int, n_scenarios: int):
+        now = time.perf_counter()
+        if n_done < n_scenarios and now - last_report[0] < 1.0:
+            return
+        last_report[0] = now
+        elapsed = now - start_time
+        print(
+            f'Solved {n_done}/{n_scenarios} scenarios in {elapsed:.1f} s',
+            file=sys.stderr
+        )
+
+    n_solved = run_sweep(
+        sweep_config,
+        out_file,
+        processes=processes,
+        resume=resume,
+        progress=report_progress
+    )
+    print(f'Solved {n_solved} scenarios in {time.perf_counter() - start_time:.1f} s. Results in {out_file}')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument(
+        'sweep_config',
+        help='Path to a StaticProductionSweepConfig'
+    )
+    parser.add_argument(
+        'out',
+        help='Output path of the results. CSV if the suffix is .csv, otherwise NDJSON',
+    )
+    parser.add_argument(
+        '--processes',
+        required=False,
+        type=int,
+        default=None,
+        help='Number of worker processes. Defaults to the number of CPUs',
+    )
+    parser.add_argument(
+        '--resume',
+        required=False,
+        action='store_true',
+        help='Skip the scenarios that are already in the output file and append the others',
+    )
+    args = parser.parse_args()
+
+    sweep_config = StaticProductionSweepConfig.load_from_file(args.sweep_config)
+    main(sweep_config, args.out, args.processes, args.resume)